@@ -0,0 +1 @@
+"""Data access and page helpers for the IUGIP UGIAP dashboard."""
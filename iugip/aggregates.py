@@ -0,0 +1,107 @@
+"""Aggregates derived once per data version and read by the pages.
+
+Everything the 'Overview' page used to compute on each render (sort, grade
+counts, Top 10) lives here, together with dense ranks, percentiles and
+Top/Bottom-N tables for the total score and every governance area, and the
+sorted totals and score profiles used to find peers of a Pourashava.
+"""
+import numpy as np
+import pandas as pd
+
+from iugip.areas import AREA_COLUMNS, AREAS
+from iugip.schema import GRADES
+
+TOP_N = 10
+
+# 'Total Score' first, then the nine areas
+SCORE_COLUMNS = ['Total Score'] + AREA_COLUMNS
+
+
+class Aggregates:
+    """Grade distribution, ranks, percentiles and Top/Bottom-N for one Overview frame."""
+
+    def __init__(self, overview, top_n=TOP_N):
+        columns = [column for column in SCORE_COLUMNS if column in overview.columns]
+        scores = overview[columns].astype('float64')
+        scores.index = overview['Pourashava'].astype(str)
+        # One row per Pourashava, so looking up a set of towns is a plain .loc
+        scores = scores[~scores.index.duplicated()]
+        self.scores = scores
+
+        # Count the number of Pourashavas in each Grade category
+        self.grade_counts = overview.groupby('Grade', observed=True)['Pourashava'].nunique()
+        self.grade_bar_counts = overview['Grade'].value_counts().reindex(GRADES)
+
+        # Rank 1 is the highest score; equal scores share a rank
+        self.ranks = scores.rank(method='dense', ascending=False)
+        # Share of Pourashavas scoring at or below each one, 0-100
+        self.percentiles = scores.rank(method='max', pct=True) * 100
+
+        # Top/Bottom-N rows per score column, best first / worst first
+        indexed = overview.set_index('Pourashava')
+        self.top = {}
+        self.bottom = {}
+        for column in columns:
+            order = scores[column].sort_values(ascending=False, kind='mergesort').dropna()
+            self.top[column] = self._table(indexed, order.index[:top_n], column)
+            self.bottom[column] = self._table(indexed, order.index[::-1][:top_n], column)
+
+        # Total Scores in ascending order, so peers by total are a window around one position
+        if 'Total Score' in columns:
+            total = scores['Total Score'].dropna().sort_values(kind='mergesort')
+            self._total_names = total.index
+            self._total_values = total.to_numpy()
+            self._total_positions = pd.Series(np.arange(len(total)), index=total.index)
+
+        # Each area as a share of its max score, so every area weighs the same in a distance
+        maxima = pd.Series({area.column: area.max_score for area in AREAS})
+        area_columns = [column for column in AREA_COLUMNS if column in columns]
+        self._profiles = (scores[area_columns] / maxima[area_columns]).fillna(0).to_numpy(dtype='float32')
+        self._profile_positions = pd.Series(np.arange(len(scores)), index=scores.index)
+
+    @staticmethod
+    def _table(indexed, names, column):
+        table = indexed.loc[names].reset_index()
+        table = table[['Pourashava', column] + (['Grade'] if column == 'Total Score' else [])]
+        # float32 scores would otherwise show their binary rounding error
+        table[column] = table[column].astype('float64').round(2)
+        table.index += 1
+        return table
+
+    def top_table(self, column='Total Score'):
+        return self.top[column]
+
+    def bottom_table(self, column='Total Score'):
+        return self.bottom[column]
+
+    def peers_by_total(self, name, k=TOP_N):
+        """The k Pourashavas whose Total Score is closest to name's, closest first."""
+        if name not in self._total_positions.index:
+            return []
+        position = self._total_positions[name]
+        start, stop = max(0, position - k), min(len(self._total_values), position + k + 1)
+        window = np.r_[start:position, position + 1:stop]
+        gaps = np.abs(self._total_values[window] - self._total_values[position])
+        return list(self._total_names[window[np.argsort(gaps, kind='mergesort')[:k]]])
+
+    def peers_by_profile(self, name, k=TOP_N):
+        """The k Pourashavas with the most similar area scores (as shares of max), closest first."""
+        if name not in self._profile_positions.index:
+            return []
+        position = self._profile_positions[name]
+        distances = ((self._profiles - self._profiles[position]) ** 2).sum(axis=1)
+        distances[position] = np.inf
+        k = min(k, len(distances) - 1)
+        nearest = np.argpartition(distances, k)[:k]
+        nearest = nearest[np.argsort(distances[nearest], kind='mergesort')]
+        return list(self._profile_positions.index[nearest])
+
+    def comparison(self, names, measure='Score'):
+        """Pourashava x score column matrix of 'Score', 'Rank' or 'Percentile' for the given towns."""
+        # Names from an older data version are left out rather than failing the lookup
+        names = [name for name in names if name in self.scores.index]
+        if measure == 'Rank':
+            return self.ranks.loc[names]
+        if measure == 'Percentile':
+            return self.percentiles.loc[names].round(0)
+        return self.scores.loc[names].round(2)
@@ -0,0 +1,75 @@
+"""The nine UGIAP governance areas and where their data lives.
+
+Every page that lists areas reads them from AREAS, so the score column, the
+label shown on the page, the max score, the indicator tab and its indicator
+columns are declared once.
+"""
+from collections import namedtuple
+
+# column: score column in 'Overview' (its max is in '<column> Max Score')
+# tab: worksheet holding the area's indicators, indicators: columns shown from it
+Area = namedtuple('Area', ['column', 'label', 'max_score', 'tab', 'indicators'])
+
+AREAS = [
+    Area('Citizen', 'Citizen Awareness and Participation', 17, 'Citizen', [
+        'TLCC Formation', 'TLCC Meetings per Year', 'TLCC Meeting Minutes', 'WC Formation',
+        'Meeting held in each Ward/3 months', 'WC Meeting Record', 'Citizen Charter Preparation',
+        'Citizen Charter Display', 'IGRC Fomration', 'Complaint Box Installation', 'GRC Meeting',
+        'GRC disclosed to TLCC',
+    ]),
+    Area('Planning', 'Urban Planning', 7, 'Planning', [
+        'PDP Status', 'Master Plan Status', 'Development Activities Control',
+    ]),
+    Area('Equity', 'Equity and Inclusiveness of Women and Urban Poor', 8, 'Equity', [
+        'STC Formation Status', 'STC Meeting', 'PRAP & GAP Status', 'PRAP & GAP Implementation Status',
+        'SIC Selection Status', 'SIC Formation Status', 'SIC Meeting',
+    ]),
+    Area('Resources', 'Enhancement of Local Resource Mobilization', 18, 'Resources', [
+        'Holding Tax Assessment in 5 year (if Due)', 'Interim Holding Tax Assessment every year',
+        'Increased Holding Tax Collection', 'Indirect Tax Status', 'Indirect Tax Collection',
+        'Tax Software Status', 'Tax Bil Procedue', 'Water Tariff Plan', 'Water Tariff Asset',
+        'Water Bill Collection',
+    ]),
+    Area('FIN MGT', 'Financial Management, Accountibility and Sustainability', 18, 'FIN MGT', [
+        'Budget Peparation', 'Annual Financial Statement', 'Audit', 'Computerized Accounting System',
+        'Staff Salary Payment', 'Electric and Telephone Bills Payment', 'Loans Payment',
+        'Fixed Assed Inventory', 'Rental and lease Value Property', 'Fixed Asset Database',
+    ]),
+    Area('O&M', 'Operation and Maintenance (O&M) and Management', 8, 'O&M', [
+        'O&M Plan', 'O&M Budget Spending', 'TLCC Satisfaction Level (O&M Plan)',
+        'Priority O&M Activities Implementation', 'Mobile Maintenance Team Fuctional',
+        'TLCC Satisfaction Level (O&M)',
+    ]),
+    Area('Survey', 'Condition Survey & Prepared Road and Drain Network and Other Assest Inventory', 4, 'Survey', [
+        'Condition Survey for Road', 'Condition Survey for Drains', 'Condition Survey for Other Assets',
+    ]),
+    Area('Transparency', 'Administrative Transparency', 6, 'Transparency', [
+        'SC Meeting', 'Training Program', 'Pourashava Website',
+    ]),
+    Area('Services', 'Keeping Essential Pourashava Services Fuctional', 14, 'Services', [
+        'SWM Action Plan', 'Solid Waste Collection', 'TLCC Satisfaction Assessment (SWM)',
+        'Drainage Maintenance Action Plan', 'Primary Drains Cleaning', 'TLCC Satisfaction Assessment (Drains)',
+        'Street Lighting Action Plan', 'Street Light Fuctional', 'TLCC Satisfaction Assessment (Streetlight)',
+        'Sanitation Action Plan', 'Pubic Toilets', 'TLCC Satisfaction (Public Toilets)',
+    ]),
+]
+
+AREAS_BY_COLUMN = {area.column: area for area in AREAS}
+AREA_COLUMNS = [area.column for area in AREAS]
+
+
+def area_title(area):
+    return '{} (Max Score {})'.format(area.label, area.max_score)
+
+
+def area_scores_long(df):
+    """One row per (area, Pourashava) with the area score, in AREAS order.
+
+    Duplicate Pourashava rows are averaged, as pd.pivot_table did per area.
+    """
+    long = df.melt(id_vars='Pourashava', value_vars=AREA_COLUMNS, var_name='Area', value_name='Score')
+    long = long.groupby(['Area', 'Pourashava'], sort=False, observed=True)['Score'].mean().reset_index()
+    # float32 scores would otherwise show their binary rounding error in tooltips
+    long['Score'] = long['Score'].astype('float64').round(2)
+    long['Title'] = long['Area'].map({area.column: area_title(area) for area in AREAS})
+    return long
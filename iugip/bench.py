@@ -0,0 +1,147 @@
+"""Page latency benchmark on synthetic data, without credentials or network.
+
+Every page is timed per stage and end to end against a FixtureSource of each
+requested size. Stages are the parts a rerun can pay for: the fetch through
+the loader (with injected latency), building the DataVersion, and each
+page's own builders. 'render' calls the page's render(data) with Streamlit
+in bare mode, so it includes serialising every element but not the browser:
+
+    python -m iugip.bench
+    python -m iugip.bench --scale 50 500 5000 --latency 0.3 --repeat 5 --json
+"""
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+
+from iugip.fixtures import FixtureSource
+from iugip.profiling import percentile
+from iugip.sheets import DASHBOARD_TABS
+from iugip.views import PAGES, load_page
+
+SCALES = [50, 500, 5000]
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    value = fn()
+    return value, (time.perf_counter() - started) * 1000
+
+
+def _summary(samples):
+    # Nearest-rank p95; with few repeats this is simply the slowest run
+    return {'median': statistics.median(samples), 'p95': percentile(samples, 95), 'runs': len(samples)}
+
+
+def load_stages(source):
+    """Cold fetch through the loader, then ingest; returns (data, {stage: ms})."""
+    from iugip.data import DataVersion
+    from iugip.loader import TAB_CACHE, load_tabs
+
+    TAB_CACHE.invalidate()
+    results, fetch_ms = _timed(lambda: load_tabs(source, DASHBOARD_TABS))
+    frames = {tab: result.frame for tab, result in results.items() if result.frame is not None}
+    data, ingest_ms = _timed(lambda: DataVersion(frames))
+    return data, {'fetch': fetch_ms, 'ingest': ingest_ms}
+
+
+def page_stages(page, data):
+    """{stage: ms} for the builders behind one page, outside Streamlit."""
+    stages = {}
+    name = data.pourashavas[0]
+    if page == 'Overview':
+        from iugip.figures import grade_bar_figure, grade_pie_figure
+        from iugip.maps import MAP_CACHE, render_map_html
+
+        MAP_CACHE.invalidate()
+        _, stages['map (cold)'] = _timed(lambda: render_map_html(data.overview))
+        _, stages['map (warm)'] = _timed(lambda: render_map_html(data.overview))
+        _, stages['figures'] = _timed(lambda: (
+            grade_pie_figure(data.aggregates.grade_counts).to_json(),
+            grade_bar_figure(data.aggregates.grade_bar_counts).to_json()))
+        _, stages['top table'] = _timed(lambda: data.aggregates.top_table('Total Score'))
+    elif page == 'Area wise Performance':
+        from iugip.figures import area_performance_chart
+
+        _, stages['chart'] = _timed(lambda: area_performance_chart(data.overview).to_json())
+    elif page == 'Pourashava Pefromance':
+        from iugip.figures import performance_figure
+
+        _, stages['figure'] = _timed(lambda: performance_figure(data.wide.loc[name], name).to_json())
+    elif page == 'Indicators':
+        import pyarrow as pa
+
+        from iugip.tables import indicator_table
+
+        table, stages['table'] = _timed(lambda: indicator_table(data.wide, data.pourashavas[:4]))
+        _, stages['arrow'] = _timed(lambda: pa.Table.from_pandas(table))
+    elif page == 'What-if':
+        from iugip.scoring import DEFAULT_RUBRIC, rubric
+        from iugip.whatif import Baseline, Scenario
+
+        # Timings only, so the placeholder rubric stands in when none is configured
+        base, stages['baseline'] = _timed(lambda: Baseline(data, rubric() or DEFAULT_RUBRIC))
+        scenario = Scenario(base)
+        _, stages['apply 10'] = _timed(lambda: scenario.set_status(
+            data.pourashavas[:10], ['Citizen Charter Display', 'Tax Software Status'], 'Yes'))
+        _, stages['aggregates'] = _timed(lambda: (scenario.changes(), scenario.top_table(), scenario.grade_bar_counts()))
+    return stages
+
+
+def run(scales=SCALES, latency=0.0, repeat=3, pages=None):
+    """{scale: {page: {stage: summary}}}; the loader stages are reported under 'load'."""
+    # Bare-mode Streamlit warns on every element; the timings are what matter here
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    # The pages' own stage logs would drown the report
+    logging.getLogger('iugip.timing').setLevel(logging.WARNING)
+    pages = pages or [page for page in PAGES if page != 'About']
+    modules = {page: load_page(page) for page in pages}
+
+    results = {}
+    for size in scales:
+        source = FixtureSource(size, latency=latency)
+        samples = {}
+        for _ in range(repeat):
+            data, stages = load_stages(source)
+            for stage, ms in stages.items():
+                samples.setdefault('load', {}).setdefault(stage, []).append(ms)
+            for page in pages:
+                samples.setdefault(page, {})
+                for stage, ms in page_stages(page, data).items():
+                    samples[page].setdefault(stage, []).append(ms)
+                # Fresh map cache so the end-to-end time is a first view of this data
+                from iugip.maps import MAP_CACHE
+                MAP_CACHE.invalidate()
+                _, ms = _timed(lambda: modules[page].render(data))
+                samples[page].setdefault('render', []).append(ms)
+                samples[page].setdefault('end to end', []).append(stages['fetch'] + stages['ingest'] + ms)
+        results[size] = {page: {stage: _summary(runs) for stage, runs in stages.items()} for page, stages in samples.items()}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=int, nargs='+', default=SCALES, help='number of Pourashavas to generate')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every fixture request')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per scale')
+    parser.add_argument('--page', nargs='+', choices=[page for page in PAGES if page != 'About'], help='only these pages')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args(argv)
+
+    results = run(args.scale, args.latency, args.repeat, args.page)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    for size, pages in results.items():
+        print('{} Pourashavas'.format(size))
+        for page, stages in pages.items():
+            print('  {}'.format(page))
+            for stage, summary in stages.items():
+                print('    {:<14} median {:>9.1f} ms   p95 {:>9.1f} ms'.format(stage, summary['median'], summary['p95']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Process-wide cache for parsed worksheet DataFrames.
+
+Modules imported by the Streamlit script survive reruns, so a cache kept at
+module level is shared by every session served by the same process.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+def frame_nbytes(value):
+    # Deep memory usage of a DataFrame, string length for rendered HTML
+    if isinstance(value, str):
+        return len(value)
+    try:
+        return int(value.memory_usage(index=True, deep=True).sum())
+    except AttributeError:
+        return 0
+
+
+class TTLCache:
+    """Thread-safe LRU cache bounded by age, entry count and byte budget.
+
+    Cached values are shared between sessions and must not be mutated by
+    callers.
+    """
+
+    def __init__(self, ttl=600, max_entries=64, max_bytes=256 * 1024 * 1024, sizeof=frame_nbytes):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries = OrderedDict()  # key -> (value, stored_at, nbytes)
+        self._nbytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries), 'bytes': self._nbytes}
+
+    def _expired(self, stored_at, now):
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def get(self, key):
+        """Return the cached value, or None when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, stored_at, _ = entry
+            if self._expired(stored_at, time.monotonic()):
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        nbytes = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            # A single value larger than the whole budget is not worth caching
+            if self.max_bytes is not None and nbytes > self.max_bytes:
+                return value
+            self._entries[key] = (value, time.monotonic(), nbytes)
+            self._nbytes += nbytes
+            self._evict()
+        return value
+
+    def get_or_load(self, key, loader):
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, loader())
+        return value
+
+    def invalidate(self, key=None):
+        """Drop one key, or everything when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._nbytes = 0
+            elif key in self._entries:
+                self._drop(key)
+
+    def _drop(self, key):
+        _, _, nbytes = self._entries.pop(key)
+        self._nbytes -= nbytes
+
+    def _evict(self):
+        # Least recently used entries go first
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._nbytes > self.max_bytes)
+        ):
+            self._drop(next(iter(self._entries)))
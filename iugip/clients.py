@@ -0,0 +1,116 @@
+"""Process-wide Google credentials and authorized API clients.
+
+Credentials are built once per process and their access token is refreshed
+ahead of expiry, so script reruns never pay for an OAuth exchange. gspread
+shares one pooled keep-alive requests session; googleapiclient services sit
+on httplib2, which is not thread-safe, so each thread gets its own.
+"""
+import datetime
+import json
+import os
+import threading
+
+import google_auth_httplib2
+import gspread
+import httplib2
+import requests
+from google.auth.transport.requests import AuthorizedSession, Request
+from google.oauth2 import service_account
+from googleapiclient.discovery import build
+from requests.adapters import HTTPAdapter
+
+from iugip.profiling import count, stage
+
+SCOPES = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+
+SERVICE_ACCOUNT_KEYS = [
+    'type', 'project_id', 'private_key_id', 'private_key', 'client_email', 'client_id',
+    'auth_uri', 'token_uri', 'auth_provider_x509_cert_url', 'client_x509_cert_url',
+]
+
+# Refresh the access token this long before it expires
+REFRESH_MARGIN = datetime.timedelta(seconds=300)
+
+POOL_SIZE = int(os.environ.get('IUGIP_HTTP_POOL_SIZE', 16))
+
+# Socket timeout of the Sheets and Drive services, so a stalled request fails
+# instead of holding its thread; the loader's per-tab wait by default
+HTTP_TIMEOUT = float(os.environ.get('IUGIP_HTTP_TIMEOUT', os.environ.get('IUGIP_FETCH_TIMEOUT', 20)))
+
+
+def service_account_info():
+    """Service account key from GOOGLE_APPLICATION_CREDENTIALS, else from st.secrets."""
+    path = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
+    if path:
+        with open(path) as f:
+            return json.load(f)
+
+    import streamlit as st
+    return {key: st.secrets[key] for key in SERVICE_ACCOUNT_KEYS}
+
+
+class Clients:
+    """Credentials plus the gspread client and Sheets/Drive services built on them."""
+
+    def __init__(self, info, scopes=SCOPES):
+        self.credentials = service_account.Credentials.from_service_account_info(info, scopes=scopes)
+        self._token_lock = threading.Lock()
+        self._local = threading.local()
+
+        # One keep-alive connection pool shared by every gspread call in the process
+        self.session = AuthorizedSession(self.credentials)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+        self.session.mount('https://', adapter)
+        # Token exchanges go over a plain session: through the authorized one they
+        # would first refresh the credentials themselves and carry the live token
+        token_session = requests.Session()
+        token_session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self._token_request = Request(token_session)
+        self._gspread = gspread.Client(auth=self.credentials, session=self.session)
+
+    def ensure_fresh(self):
+        """Refresh the access token if it is missing or close to expiry."""
+        credentials = self.credentials
+        if credentials.valid and credentials.expiry - datetime.datetime.utcnow() > REFRESH_MARGIN:
+            return
+        with self._token_lock:
+            # Another thread may have refreshed while we waited
+            if not credentials.valid or credentials.expiry - datetime.datetime.utcnow() <= REFRESH_MARGIN:
+                count('auth.refresh')
+                with stage('auth.refresh'):
+                    credentials.refresh(self._token_request)
+
+    @property
+    def gspread(self):
+        self.ensure_fresh()
+        return self._gspread
+
+    def _service(self, name, version):
+        self.ensure_fresh()
+        services = getattr(self._local, 'services', None)
+        if services is None:
+            services = self._local.services = {}
+        if (name, version) not in services:
+            http = google_auth_httplib2.AuthorizedHttp(self.credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+            services[name, version] = build(name, version, http=http, cache_discovery=False)
+        return services[name, version]
+
+    def sheets(self):
+        return self._service('sheets', 'v4')
+
+    def drive(self):
+        return self._service('drive', 'v3')
+
+
+_clients = None
+_clients_lock = threading.Lock()
+
+
+def get_clients():
+    """The process-wide Clients, built on first use."""
+    global _clients
+    with _clients_lock:
+        if _clients is None:
+            with stage('auth.build'):
+                _clients = Clients(service_account_info())
+        return _clients
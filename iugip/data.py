@@ -0,0 +1,80 @@
+"""Immutable, ready-to-render view of one version of the dashboard data."""
+import logging
+import time
+
+from iugip import scoring
+from iugip.aggregates import Aggregates
+from iugip.areas import AREAS
+from iugip.ingest import build_wide
+from iugip.profiling import stage
+from iugip.schema import validate
+
+logger = logging.getLogger(__name__)
+
+
+class DataVersion:
+    """Parsed tabs plus everything derived from them for one spreadsheet version.
+
+    Instances are built off the request path and never modified afterwards,
+    so a script run can keep reading one while a newer one is swapped in.
+    """
+
+    def __init__(self, frames, version=None, modified_time=None, errors=None, as_of=None, stale=False):
+        self.frames = frames
+        self.version = version
+        self.modified_time = modified_time
+        self.errors = errors or {}  # tab -> status for tabs that failed to load
+        self.built_at = time.time()
+        # When the frames were read from the source, and whether they are a fallback copy
+        self.as_of = as_of or self.built_at
+        self.stale = stale
+
+        # Range and grade checks on the typed tabs: tab -> list of problems
+        self.schema_issues = {}
+        with stage('ingest.validate'):
+            for tab, frame in frames.items():
+                issues = validate(tab, frame)
+                if issues:
+                    self.schema_issues[tab] = issues
+                    logger.warning('Schema issues in %s: %s', tab, '; '.join(issues))
+
+        # Every tab joined on Pourashava, so selecting a town is one index lookup
+        overview = frames.get('Overview')
+        with stage('ingest.wide'):
+            self.wide, self.name_report = build_wide(overview, frames) if overview is not None else (None, None)
+        self.pourashavas = sorted(self.wide.index) if self.wide is not None else []
+
+        # Scores recomputed from the indicator tabs, and where they disagree with the sheet;
+        # only with the official rubric, as any other would flag nearly every town
+        self.scores = self.score_mismatches = None
+        if self.wide is not None and scoring.rubric() is not None:
+            with stage('ingest.scoring'):
+                self._score([area for area in AREAS if area.tab in frames])
+
+        # Grade counts, ranks and Top/Bottom-N, computed once for this version
+        with stage('ingest.aggregates'):
+            self.aggregates = Aggregates(self.overview) if self.overview is not None else None
+
+    def _score(self, areas):
+        rubric = scoring.rubric()
+        result = scoring.score(self.wide, areas, rubric.status_points, rubric.points, rubric.bands)
+        if len(areas) < len(AREAS):
+            # A partial total would disagree everywhere; only the loaded areas are compared
+            result = result._replace(scores=result.scores.drop(columns=['Total Score', 'Grade']))
+        self.scores = result
+        self.score_mismatches = scoring.compare(result.scores, self.wide)
+        if len(self.score_mismatches):
+            logger.warning('%d scores differ from the sheet', len(self.score_mismatches))
+
+        if scoring.SCORE_SOURCE == 'computed' and len(areas) == len(AREAS):
+            computed = result.scores
+            overview = self.frames['Overview'].copy()
+            names = overview['Pourashava'].astype(str)
+            for column in computed.columns:
+                overview[column] = names.map(computed[column]).astype(computed[column].dtype)
+                self.wide[column] = computed[column]
+            self.frames = dict(self.frames, Overview=overview)
+
+    @property
+    def overview(self):
+        return self.frames.get('Overview')
@@ -0,0 +1,129 @@
+"""Chart builders shared by the dashboard pages and offline tools.
+
+Nothing here touches Streamlit. Each builder imports its charting backend
+itself, so a page only loads the library it actually draws with.
+"""
+from iugip.areas import AREAS, area_scores_long, area_title
+
+
+def area_performance_chart(df, width=800, height=300):
+    """One Vega-Lite spec with a bar chart per governance area, stacked vertically."""
+    import altair as alt
+
+    long = area_scores_long(df)[['Title', 'Pourashava', 'Score']]
+    chart = alt.Chart(long).mark_bar().encode(
+        x=alt.X('Pourashava', axis=alt.Axis(title=None)),
+        y=alt.Y('Score:Q', axis=alt.Axis(title='Score')),
+        tooltip=['Pourashava', 'Score:Q']
+    ).properties(
+        width=width,
+        height=height
+    ).facet(
+        row=alt.Row('Title:N', sort=[area_title(area) for area in AREAS], header=alt.Header(
+            title=None, labelOrient='top', labelAnchor='start', labelAngle=0, labelFontSize=20, labelFontWeight='bold'))
+    ).resolve_scale(
+        # Each area keeps its own score range, and every row shows its own Pourashava axis
+        y='independent'
+    ).resolve_axis(
+        x='independent'
+    )
+
+    # Set the axis labels
+    return chart.configure_axis(
+        labelFontSize=12,
+        titleFontSize=14,
+        labelAngle=-90
+    )
+
+
+def area_vectors(row):
+    """(labels, achieved, max scores) for one Pourashava row, in AREAS order."""
+    import numpy as np
+
+    labels = [area.label for area in AREAS]
+    # Rounded, as float32 scores would otherwise show their binary rounding error on hover
+    achieved = row.reindex([area.column for area in AREAS]).astype('float64').round(2).to_numpy()
+    max_scores = row.reindex([area.column + ' Max Score' for area in AREAS]).astype('float64').to_numpy()
+    # Fall back to the registry when the sheet's max score is blank
+    max_scores = np.where(np.isnan(max_scores), [area.max_score for area in AREAS], max_scores)
+    return labels, achieved, max_scores
+
+
+def performance_figure(row, title=None, percent=False):
+    """Achievement against max score for all nine areas of one Pourashava, in one figure."""
+    import plotly.graph_objs as go
+
+    labels, achieved, max_scores = area_vectors(row)
+
+    fig = go.Figure()
+    if percent:
+        fig.add_trace(go.Bar(
+            x=labels, y=achieved / max_scores * 100, name='Achievement (% of max)', marker=dict(color='darkblue'),
+            customdata=list(zip(achieved, max_scores)),
+            hovertemplate='%{x}<br>%{y:.0f}% (%{customdata[0]:g} of %{customdata[1]:g})<extra></extra>',
+        ))
+        fig.update_layout(yaxis_title='% of Max Score', yaxis_range=[0, 100])
+    else:
+        fig.add_trace(go.Bar(x=labels, y=achieved, offsetgroup=0, name='Achievement', marker=dict(color='darkblue')))
+        fig.add_trace(go.Bar(x=labels, y=max_scores, offsetgroup=1, name='Max Score', marker=dict(color='lightblue')))
+        fig.update_layout(yaxis_title='Score', barmode='group')
+
+    if title:
+        fig.update_layout(title={'text': title, 'font': {'size': 24}})
+    fig.update_layout(height=600, legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1))
+    return fig
+
+
+def grade_pie_figure(counts):
+    """Share of Pourashavas in each grade, legend below the pie."""
+    import plotly.graph_objs as go
+
+    fig = go.Figure(data=[go.Pie(labels=counts.index, values=counts.values)])
+    # Move the legend of the pie chart to the bottom
+    fig.update_layout(legend=dict(orientation='h', yanchor='top', y=0, xanchor='left', x=0.25))
+    return fig
+
+
+def grade_bar_figure(counts):
+    """Horizontal bar chart of the grade counts."""
+    import plotly.graph_objs as go
+
+    return go.Figure(data=[go.Bar(x=counts.values, y=counts.index, orientation='h')])
+
+
+def trend_chart(trend, title='Score', width=800, height=400):
+    """One line per Pourashava across the recorded assessment cycles."""
+    import altair as alt
+
+    cycles = list(trend['Cycle'].cat.categories) if hasattr(trend['Cycle'], 'cat') else None
+    data = trend[['Cycle', 'Pourashava', 'Score']].astype({'Cycle': str, 'Score': 'float64'}).round({'Score': 2})
+    return alt.Chart(data).mark_line(point=True).encode(
+        x=alt.X('Cycle:O', sort=cycles, axis=alt.Axis(title='Assessment cycle', labelAngle=0)),
+        y=alt.Y('Score:Q', axis=alt.Axis(title=title)),
+        color=alt.Color('Pourashava:N'),
+        tooltip=['Pourashava', 'Cycle', 'Score:Q']
+    ).properties(
+        width=width,
+        height=height
+    )
+
+
+def comparison_figure(rows, percent=False):
+    """Area scores of several Pourashavas side by side, one bar group per area."""
+    import plotly.graph_objs as go
+
+    fig = go.Figure()
+    for name, row in rows.iterrows():
+        labels, achieved, max_scores = area_vectors(row)
+        fig.add_trace(go.Bar(x=labels, y=achieved / max_scores * 100 if percent else achieved, name=str(name)))
+    if not percent:
+        # Max score of each area as a tick mark over its bar group
+        labels, _, max_scores = area_vectors(rows.iloc[0])
+        fig.add_trace(go.Scatter(x=labels, y=max_scores, name='Max Score', mode='markers', marker=dict(symbol='line-ew-open', size=30, color='gray')))
+    fig.update_layout(
+        barmode='group', height=600, yaxis_title='% of Max Score' if percent else 'Score',
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1),
+    )
+    if percent:
+        fig.update_layout(yaxis_range=[0, 100])
+    return fig
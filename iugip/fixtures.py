@@ -0,0 +1,95 @@
+"""Synthetic stand-in for the dashboard spreadsheet.
+
+FixtureSource serves the same tabs and columns as 'Pourashava_Dashboard_V3'
+for any number of Pourashavas, with optional injected latency and failures
+per request, so pages can be run and benchmarked without credentials or
+network.
+"""
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from iugip.areas import AREAS
+from iugip.profiling import count
+from iugip.schema import LAT_RANGE, LON_RANGE, coerce
+from iugip.scoring import score
+from iugip.sheets import SPREADSHEET_NAME
+from iugip.sources import DataSource
+
+
+def make_frames(size=50, seed=0):
+    """Untyped frames for every dashboard tab, shaped like get_all_records output."""
+    rng = np.random.default_rng(seed)
+    names = ['Pourashava {:04d}'.format(i + 1) for i in range(size)]
+
+    overview = pd.DataFrame({
+        'Pourashava': names,
+        'Lat': rng.uniform(LAT_RANGE[0] + 0.5, LAT_RANGE[1] - 0.5, size).round(4),
+        'Lon': rng.uniform(LON_RANGE[0] + 0.5, LON_RANGE[1] - 0.5, size).round(4),
+    })
+    # Each town gets its own chance of meeting an indicator, skewed upwards so every grade band shows up
+    quality = rng.beta(4, 1.5, size)[:, None]
+    frames = {}
+    for area in AREAS:
+        draws = rng.random((size, len(area.indicators)))
+        statuses = np.where(draws < quality * 0.85, 'Yes', np.where(draws < quality * 0.85 + 0.1, 'Partially', 'No'))
+        statuses[draws > 0.98] = 'Not Due'
+        frame = pd.DataFrame(statuses, columns=area.indicators)
+        frame.insert(0, 'Pourashava', names)
+        frames[area.tab] = frame
+
+    # The sheet's own formulas, as the scoring rubric would compute them
+    indicators = pd.concat([frames[area.tab].set_index('Pourashava') for area in AREAS], axis=1)
+    scores = score(indicators).scores
+    for area in AREAS:
+        overview[area.column] = scores[area.column].round(2).to_numpy()
+        overview[area.column + ' Max Score'] = area.max_score
+    overview['Total Score'] = scores['Total Score'].round(2).to_numpy()
+    overview['Grade'] = scores['Grade'].astype(str).to_numpy()
+    frames['Overview'] = overview
+    return frames
+
+
+class FixtureSource(DataSource):
+    """Synthetic spreadsheet with a configurable size, per-request latency and failure rate."""
+
+    snapshots = False
+
+    def __init__(self, size=50, latency=0.0, seed=0, failure_rate=0.0):
+        self.name = 'fixture-{}'.format(size)
+        self.size = size
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self._version = 1
+        self._frames = {tab: coerce(tab, frame) for tab, frame in make_frames(size, seed).items()}
+
+    def _request(self):
+        self.requests += 1
+        count('fixture.requests')
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            # Looks like a dropped connection to the loader's retry logic
+            raise ConnectionError('Injected fixture failure')
+
+    def touch(self, seed=None):
+        """Simulate an edit: new data and a new version."""
+        self._version += 1
+        seed = self._version if seed is None else seed
+        self._frames = {tab: coerce(tab, frame) for tab, frame in make_frames(self.size, seed).items()}
+
+    def version(self, spreadsheet=SPREADSHEET_NAME):
+        self._request()
+        return str(self._version), None
+
+    def fetch_tabs(self, tabs, spreadsheet=SPREADSHEET_NAME):
+        self._request()
+        return {tab: self._frames[tab] for tab in tabs if tab in self._frames}
+
+    def fetch_tab(self, tab, spreadsheet=SPREADSHEET_NAME):
+        self._request()
+        return self._frames[tab]
+
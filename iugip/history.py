@@ -0,0 +1,253 @@
+"""Append-only history of the UGIAP assessment cycles.
+
+Each cycle's Overview scores are frozen as one Parquet file when the cycle
+is recorded, and the change against the previous cycle is worked out at that
+moment, from that one previous file, and stored next to it. Cumulative change
+since the first cycle is carried forward the same way, so recording cycle N
+never reads cycles 1..N-2, and "most improved" only ever reads the latest
+delta file. Trend charts read just the columns they plot:
+
+    python -m iugip.history record 2024 --snapshot .snapshots
+    python -m iugip.history list
+    python -m iugip.history improved --measure Citizen --since first
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from iugip.aggregates import SCORE_COLUMNS, TOP_N
+from iugip.cache import TTLCache
+from iugip.ingest import normalize_name
+from iugip.schema import GRADE_DTYPE, GRADES
+from iugip.snapshot import frame_digest
+
+HISTORY_DIR = os.environ.get('IUGIP_HISTORY_DIR', '.history')
+
+# Trend frames by (recorded cycles, measure); cycles never change once recorded
+TREND_CACHE = TTLCache(ttl=None, max_entries=32, max_bytes=32 * 1024 * 1024)
+
+
+def cycle_frame(overview):
+    """The columns kept for one cycle: names, scores and grade, keyed by normalised name."""
+    columns = [column for column in SCORE_COLUMNS if column in overview.columns]
+    frame = pd.DataFrame({'Key': overview['Pourashava'].map(normalize_name), 'Pourashava': overview['Pourashava'].astype(str)})
+    for column in columns:
+        frame[column] = overview[column].astype('float32').to_numpy()
+    frame['Grade'] = overview['Grade'].astype(str).to_numpy() if 'Grade' in overview.columns else None
+    # The first row wins when a name is listed twice, as in build_wide
+    return frame.drop_duplicates('Key').reset_index(drop=True)
+
+
+def _grade_steps(grades):
+    # A+ is 4 and D is 0, so a positive difference is an improvement
+    codes = pd.Categorical(grades, dtype=GRADE_DTYPE).codes.astype('float32')
+    codes[codes < 0] = np.nan
+    return len(GRADES) - 1 - codes
+
+
+def cycle_deltas(current, previous=None, previous_deltas=None):
+    """Change per Pourashava against the previous cycle, and since the first one.
+
+    Pourashavas new in this cycle get no change, and their 'since first' starts at 0.
+    """
+    deltas = current[['Key', 'Pourashava', 'Grade']].copy()
+    if previous is None:
+        previous = current.iloc[:0]
+    prev = current[['Key']].merge(previous, on='Key', how='left')
+    deltas['Previous Grade'] = prev['Grade'].to_numpy()
+    deltas['Grade Change'] = _grade_steps(deltas['Grade']) - _grade_steps(deltas['Previous Grade'])
+
+    carried = None
+    if previous_deltas is not None:
+        carried = current[['Key']].merge(previous_deltas, on='Key', how='left')
+    for column in SCORE_COLUMNS:
+        if column not in current.columns:
+            continue
+        before = prev[column].to_numpy() if column in prev.columns else np.nan
+        change = (current[column].to_numpy() - before).astype('float32')
+        deltas[column + ' Change'] = change
+        since = carried[column + ' Since First'].to_numpy() if carried is not None and column + ' Since First' in carried.columns else np.zeros(len(current), 'float32')
+        # A Pourashava missing from the previous cycle starts again from 0
+        deltas[column + ' Since First'] = (np.nan_to_num(since) + np.nan_to_num(change)).astype('float32')
+    return deltas
+
+
+class HistoryStore:
+    """Recorded assessment cycles, oldest first, with their deltas."""
+
+    def __init__(self, root=HISTORY_DIR):
+        self.path = root
+        self._lock = threading.RLock()
+        self._manifest = None
+        self._mtime = None
+
+    @property
+    def manifest(self):
+        path = os.path.join(self.path, 'manifest.json')
+        with self._lock:
+            # Cycles are recorded by the CLI in another process; pick them up when the file moves
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if self._manifest is None or mtime != self._mtime:
+                try:
+                    with open(path) as f:
+                        self._manifest = json.load(f)
+                except (OSError, ValueError):
+                    self._manifest = {'cycles': []}
+                self._mtime = mtime
+            return self._manifest
+
+    def cycles(self):
+        return [entry['cycle'] for entry in self.manifest['cycles']]
+
+    def _file(self, kind, cycle):
+        return os.path.join(self.path, kind, '{}.parquet'.format(cycle))
+
+    def _write(self, kind, cycle, frame):
+        path = self._file(kind, cycle)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp'
+        pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), tmp)
+        os.replace(tmp, path)
+
+    def read(self, cycle, columns=None):
+        return pq.read_table(self._file('cycles', cycle), columns=columns).to_pandas()
+
+    def deltas(self, cycle=None, columns=None):
+        """Deltas recorded with a cycle, the latest one by default."""
+        cycles = self.cycles()
+        if not cycles:
+            return None
+        return pq.read_table(self._file('deltas', cycle or cycles[-1]), columns=columns).to_pandas()
+
+    def append(self, cycle, overview):
+        """Record a cycle. Returns False when it is already recorded with the same scores.
+
+        Cycles are never rewritten; recording a known cycle with different
+        scores raises ValueError.
+        """
+        cycle = str(cycle)
+        if not cycle or os.sep in cycle or cycle.startswith('.'):
+            raise ValueError('Invalid cycle label {!r}'.format(cycle))
+        current = cycle_frame(overview)
+        digest = frame_digest(current)
+        with self._lock:
+            known = {entry['cycle']: entry for entry in self.manifest['cycles']}
+            if cycle in known:
+                if known[cycle]['digest'] == digest:
+                    return False
+                raise ValueError('Cycle {} is already recorded with different scores'.format(cycle))
+
+            cycles = self.cycles()
+            previous = self.read(cycles[-1]) if cycles else None
+            previous_deltas = self.deltas(cycles[-1]) if cycles else None
+            deltas = cycle_deltas(current, previous, previous_deltas)
+
+            # Data files first, so a crash never leaves the manifest pointing at nothing
+            self._write('cycles', cycle, current)
+            self._write('deltas', cycle, deltas)
+            self._manifest['cycles'].append({'cycle': cycle, 'recorded_at': time.time(), 'digest': digest, 'rows': len(current)})
+            os.makedirs(self.path, exist_ok=True)
+            tmp = os.path.join(self.path, 'manifest.json.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(self._manifest, f, indent=2)
+            os.replace(tmp, os.path.join(self.path, 'manifest.json'))
+            self._mtime = os.stat(os.path.join(self.path, 'manifest.json')).st_mtime_ns
+            return True
+
+    def trend(self, measure='Total Score'):
+        """Long frame of Cycle, Pourashava and Score over every recorded cycle."""
+        cycles = tuple(self.cycles())
+
+        def load():
+            parts = []
+            for cycle in cycles:
+                # Only the plotted column is read from each file
+                part = self.read(cycle, columns=['Key', 'Pourashava', measure])
+                part.insert(0, 'Cycle', cycle)
+                parts.append(part.rename(columns={measure: 'Score'}))
+            if not parts:
+                return pd.DataFrame(columns=['Cycle', 'Key', 'Pourashava', 'Score'])
+            trend = pd.concat(parts, ignore_index=True)
+            # Show each town under its latest spelling
+            trend['Pourashava'] = trend.groupby('Key')['Pourashava'].transform('last')
+            trend['Cycle'] = pd.Categorical(trend['Cycle'], categories=list(cycles), ordered=True)
+            return trend
+
+        return TREND_CACHE.get_or_load((self.path, cycles, measure), load)
+
+    def most_improved(self, measure='Total Score', since='previous', n=TOP_N):
+        """Top-n Pourashavas by change in the latest cycle, or since the first one."""
+        column = measure + (' Change' if since == 'previous' else ' Since First')
+        deltas = self.deltas(columns=['Pourashava', 'Grade', 'Previous Grade', 'Grade Change', column])
+        if deltas is None:
+            return None
+        table = deltas.dropna(subset=[column]).sort_values(column, ascending=False, kind='mergesort').head(n)
+        table[column] = table[column].astype('float64').round(2)
+        table = table.reset_index(drop=True)
+        table.index += 1
+        return table
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def history_store(root=HISTORY_DIR):
+    """The process-wide history store, or None when IUGIP_HISTORY_DIR is empty."""
+    if not root:
+        return None
+    with _stores_lock:
+        if root not in _stores:
+            _stores[root] = HistoryStore(root)
+        return _stores[root]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Record and query UGIAP assessment cycles.')
+    parser.add_argument('--history', default=HISTORY_DIR or '.history', help='history directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+    record = commands.add_parser('record', help='freeze the current Overview scores as a cycle')
+    record.add_argument('cycle', help='cycle label, e.g. 2024; cycles are ordered as recorded')
+    record.add_argument('--snapshot', help='read the Overview from this snapshot directory instead of the live sheet')
+    commands.add_parser('list', help='recorded cycles')
+    improved = commands.add_parser('improved', help='most improved Pourashavas in the latest cycle')
+    improved.add_argument('--measure', default='Total Score', choices=SCORE_COLUMNS)
+    improved.add_argument('--since', default='previous', choices=['previous', 'first'])
+    improved.add_argument('-n', type=int, default=TOP_N)
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.history)
+    if args.command == 'record':
+        from iugip.report import load_live, load_snapshot
+
+        data = load_snapshot(args.snapshot) if args.snapshot else load_live()
+        try:
+            added = store.append(args.cycle, data.overview)
+        except ValueError as exc:
+            parser.error(str(exc))
+        print('Recorded cycle {}'.format(args.cycle) if added else 'Cycle {} is already recorded'.format(args.cycle))
+    elif args.command == 'list':
+        for entry in store.manifest['cycles']:
+            print('{}  {} Pourashavas  recorded {}'.format(
+                entry['cycle'], entry['rows'], time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['recorded_at']))))
+    else:
+        table = store.most_improved(args.measure, args.since, args.n)
+        if table is None:
+            parser.error('no cycles recorded in ' + args.history)
+        print(table.to_string())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Cold import time of the app core and of each page module.
+
+Every module is imported in a fresh interpreter with ``python -X importtime``
+so results do not depend on what was imported before. Page modules are
+measured on top of the app core, which is what a session pays when it first
+opens that page. Exits non-zero when a module goes over its budget:
+
+    python -m iugip.importtime
+    python -m iugip.importtime --scale 2 --json
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+from iugip.views import PAGES
+
+# Modules every script run imports before a page is selected
+CORE = ['streamlit', 'iugip.clients', 'iugip.sources', 'iugip.refresher', 'iugip.views']
+
+# Budgets in milliseconds, generous enough to absorb machine noise
+BUDGETS_MS = {
+    'streamlit': 2500,
+    'iugip.clients': 1500,
+    'iugip.sources': 100,
+    'iugip.refresher': 2000,
+    'iugip.views': 50,
+    'iugip.views.about': 50,
+    'iugip.views.overview': 1500,
+    'iugip.views.area': 1500,
+    'iugip.views.performance': 1500,
+    'iugip.views.indicators': 300,
+    'iugip.views.trends': 1500,
+    'iugip.views.whatif': 1500,
+}
+
+
+def measure(module, preload=()):
+    """Cumulative import time of module in ms, after importing preload first."""
+    code = ''.join('import {}\n'.format(name) for name in list(preload) + [module])
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, universal_newlines=True, check=True,
+    )
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    for line in proc.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    # Already imported by the preload
+    return 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply every budget, e.g. on slow CI hosts')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for index, module in enumerate(CORE):
+        results[module] = measure(module, CORE[:index])
+    for module in PAGES.values():
+        results[module] = measure(module, CORE)
+
+    over = {module: ms for module, ms in results.items() if ms > BUDGETS_MS.get(module, float('inf')) * args.scale}
+    if args.json:
+        print(json.dumps({'import_ms': results, 'over_budget': sorted(over)}, indent=2))
+    else:
+        for module, ms in results.items():
+            flag = '  OVER BUDGET' if module in over else ''
+            print('{:<28} {:>8.1f} ms  (budget {:.0f}){}'.format(
+                module, ms, BUDGETS_MS.get(module, float('inf')) * args.scale, flag))
+    return 1 if over else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Join the Overview and indicator tabs into one table indexed by Pourashava.
+
+The tabs are typed by hand in the spreadsheet, so the same town can be
+spelled differently from tab to tab. Names are matched after normalising
+case and whitespace, then by close spelling, and every mismatch is reported
+instead of silently dropping rows.
+"""
+import difflib
+import logging
+from collections import namedtuple
+
+import pandas as pd
+
+from iugip.areas import AREAS
+
+logger = logging.getLogger(__name__)
+
+# Similarity needed to treat two spellings as the same Pourashava
+MATCH_CUTOFF = 0.85
+
+# missing: tab -> Overview names absent from that tab (None when the whole tab is missing)
+# unmatched: tab -> names in the tab that match no Overview name
+# respelled: tab -> {spelling in the tab: spelling in Overview}
+# duplicates: tab -> names listed more than once (the first row is kept)
+NameReport = namedtuple('NameReport', ['missing', 'unmatched', 'respelled', 'duplicates'])
+
+
+def normalize_name(name):
+    return ' '.join(str(name).split()).casefold()
+
+
+def _resolve(names, canonical, respelled):
+    # Map each spelling in a tab onto the Overview spelling, or None
+    keys = list(canonical)
+    resolved = []
+    for name in names:
+        key = normalize_name(name)
+        if key not in canonical:
+            close = difflib.get_close_matches(key, keys, n=1, cutoff=MATCH_CUTOFF)
+            key = close[0] if close else None
+        match = canonical.get(key)
+        if match is not None and match != name:
+            respelled[name] = match
+        resolved.append(match)
+    return resolved
+
+
+def build_wide(overview, frames, areas=AREAS):
+    """Return (wide, report): Overview columns plus every indicator column, one row per Pourashava."""
+    report = NameReport({}, {}, {}, {})
+
+    # Names are matched as plain strings; the categorical dtype is only for storage
+    overview = overview.assign(Pourashava=overview['Pourashava'].astype(str))
+    base = overview.drop_duplicates('Pourashava').set_index('Pourashava')
+    duplicated = overview.loc[overview['Pourashava'].duplicated(), 'Pourashava']
+    if len(duplicated):
+        report.duplicates['Overview'] = sorted(duplicated.astype(str).unique())
+    canonical = {normalize_name(name): name for name in base.index}
+
+    parts = [base]
+    for area in areas:
+        tab = frames.get(area.tab)
+        if tab is None or 'Pourashava' not in tab.columns:
+            report.missing[area.tab] = None
+            continue
+
+        respelled = {}
+        spellings = tab['Pourashava'].astype(str)
+        unique = spellings.unique()
+        lookup = dict(zip(unique, _resolve(unique, canonical, respelled)))
+        resolved = spellings.map(lookup)
+
+        if respelled:
+            report.respelled[area.tab] = respelled
+        unmatched = spellings[resolved.isna()]
+        if len(unmatched):
+            report.unmatched[area.tab] = sorted(unmatched.astype(str).unique())
+        duplicated = resolved[resolved.notna() & resolved.duplicated()]
+        if len(duplicated):
+            report.duplicates[area.tab] = sorted(duplicated.unique())
+        missing = base.index.difference(resolved.dropna())
+        if len(missing):
+            report.missing[area.tab] = sorted(missing)
+
+        part = tab.reindex(columns=area.indicators)
+        part.index = pd.Index(resolved, name='Pourashava')
+        part = part[part.index.notna() & ~part.index.duplicated()]
+        # Indicator columns that clash with an earlier tab keep the tab name
+        part.columns = [
+            column if not any(column in earlier.columns for earlier in parts) else '{} ({})'.format(column, area.tab)
+            for column in part.columns
+        ]
+        parts.append(part)
+
+    wide = pd.concat(parts, axis=1, join='outer').reindex(base.index)
+
+    for field in report._fields:
+        for tab, names in getattr(report, field).items():
+            logger.warning('Pourashava names %s in %s: %s', field, tab, names if names is not None else 'whole tab')
+    return wide, report
+
+
+def has_issues(report):
+    return any(getattr(report, field) for field in report._fields)
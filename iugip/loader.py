@@ -0,0 +1,220 @@
+"""Cached, concurrent loading of worksheet tabs.
+
+Cache misses are served from the local Parquet snapshot when one is
+configured; otherwise they are grouped per spreadsheet into values.batchGet
+chunks (or one task per tab when batching is off). Either way they run on a
+bounded, process-wide thread pool. Each task retries 429/5xx responses with
+jittered backoff, and callers get one TabResult per tab so a single failing
+tab does not sink the page.
+
+submit_tabs() is the first-load variant: every tab is its own task, read
+from the snapshot when it is current or with one single-range request, so
+each one can be shown as soon as it arrives.
+"""
+import math
+import os
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from googleapiclient.errors import HttpError
+from gspread.exceptions import APIError
+
+from iugip.cache import TTLCache
+from iugip.profiling import stage
+from iugip.sheets import SPREADSHEET_NAME
+from iugip.snapshot import snapshot_store
+
+MAX_WORKERS = int(os.environ.get('IUGIP_FETCH_WORKERS', 8))
+TAB_TIMEOUT = float(os.environ.get('IUGIP_FETCH_TIMEOUT', 20))
+MAX_ATTEMPTS = int(os.environ.get('IUGIP_FETCH_ATTEMPTS', 4))
+BATCH_LIMIT = 12  # tabs per values.batchGet request
+
+# One entry per (spreadsheet, tab), shared by every session of this process
+TAB_CACHE = TTLCache(
+    ttl=float(os.environ.get('IUGIP_CACHE_TTL', 600)),
+    max_entries=int(os.environ.get('IUGIP_CACHE_MAX_ENTRIES', 64)),
+    max_bytes=int(float(os.environ.get('IUGIP_CACHE_MAX_MB', 256)) * 1024 * 1024),
+)
+
+# status is 'ok', 'cached', 'timeout' or 'error'; frame is None unless the read succeeded
+TabResult = namedtuple('TabResult', ['tab', 'spreadsheet', 'status', 'frame', 'error', 'attempts', 'elapsed'])
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='iugip-fetch')
+
+
+def _status_code(exc):
+    if isinstance(exc, APIError):
+        return exc.response.status_code
+    if isinstance(exc, HttpError):
+        return int(exc.resp.status)
+    return None
+
+
+def is_retryable(exc):
+    """Quota (429), server-side (5xx) and connection errors are worth another try."""
+    code = _status_code(exc)
+    if code is not None:
+        return code == 429 or code >= 500
+    return isinstance(exc, OSError)
+
+
+def _run_with_retries(fn, deadline, base_delay=0.5):
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return fn(), attempt, None
+        except Exception as exc:
+            if attempt >= MAX_ATTEMPTS or not is_retryable(exc):
+                return None, attempt, exc
+            # Full jitter, so retries from concurrent sessions do not line up
+            delay = random.uniform(0, base_delay * 2 ** (attempt - 1))
+            if time.monotonic() + delay >= deadline:
+                return None, attempt, exc
+            time.sleep(delay)
+
+
+def _from_snapshot(store, source, spreadsheet, tabs):
+    frames, changed = store.load(source, tabs)
+    # Other tabs that moved with this sync must not keep being served from memory
+    for tab in changed:
+        TAB_CACHE.invalidate((spreadsheet, tab))
+    return frames
+
+
+def _fetch_task(source, spreadsheet, tabs, batch, timeout, read=None):
+    started = time.monotonic()
+    store = snapshot_store(spreadsheet) if source.snapshots else None
+    if read is not None:
+        fn = lambda: read(tabs[0])
+    elif store is not None:
+        fn = lambda: _from_snapshot(store, source, spreadsheet, tabs)
+    elif batch:
+        fn = lambda: source.fetch_tabs(tabs, spreadsheet)
+    else:
+        fn = lambda: {tabs[0]: source.fetch_tab(tabs[0], spreadsheet)}
+    frames, attempts, error = _run_with_retries(fn, started + timeout)
+    elapsed = time.monotonic() - started
+
+    results = {}
+    for tab in tabs:
+        frame = frames.get(tab) if frames is not None else None
+        if frame is not None:
+            # Late results from a timed-out wait still warm the cache for the next run
+            TAB_CACHE.put((spreadsheet, tab), frame)
+            results[tab] = TabResult(tab, spreadsheet, 'ok', frame, None, attempts, elapsed)
+        else:
+            results[tab] = TabResult(tab, spreadsheet, 'error', None, error, attempts, elapsed)
+    return results
+
+
+def _spec(item, spreadsheet):
+    # Tabs are given as plain names or as (spreadsheet, tab) pairs
+    return item if isinstance(item, tuple) else (spreadsheet, item)
+
+
+def load_tabs(source, tabs, spreadsheet=SPREADSHEET_NAME, batch=True, timeout=TAB_TIMEOUT):
+    """Return {tab: TabResult}, reading every cache miss in parallel."""
+    results = {}
+    missing = {}
+    for item in tabs:
+        book, tab = _spec(item, spreadsheet)
+        frame = TAB_CACHE.get((book, tab))
+        if frame is not None:
+            results[item] = TabResult(tab, book, 'cached', frame, None, 0, 0.0)
+        else:
+            missing.setdefault(book, []).append((item, tab))
+
+    # One task per batchGet chunk, or one per tab when batching is off
+    tasks = []
+    for book, items in missing.items():
+        size = BATCH_LIMIT if batch else 1
+        for start in range(0, len(items), size):
+            chunk = items[start:start + size]
+            future = _executor.submit(_fetch_task, source, book, [tab for _, tab in chunk], batch, timeout)
+            tasks.append((future, book, chunk))
+
+    if tasks:
+        # Queued tasks only start once a worker frees up, so allow one timeout per wave
+        waves = math.ceil(len(tasks) / MAX_WORKERS)
+        with stage('load.wait', tasks=len(tasks)):
+            wait([future for future, _, _ in tasks], timeout=timeout * waves)
+        for future, book, chunk in tasks:
+            task_results = future.result() if future.done() else {}
+            for item, tab in chunk:
+                results[item] = task_results.get(
+                    tab, TabResult(tab, book, 'timeout', None, None, 0, timeout * waves))
+
+    return {item: results[item] for item in tabs}
+
+
+def _fetch_one(source, spreadsheet, tab, timeout, read):
+    return _fetch_task(source, spreadsheet, [tab], False, timeout, read)[tab]
+
+
+def _tab_reader(source, spreadsheet):
+    # Reads one tab on its own: from the snapshot when it already holds the
+    # current Drive version, else with a single-range values request. Nothing
+    # here holds the store lock for a whole sync, so tabs land independently.
+    store = snapshot_store(spreadsheet) if source.snapshots else None
+    lock = threading.Lock()
+    versions = []
+
+    def current_version():
+        # Looked up once for all the tabs
+        with lock:
+            if not versions:
+                try:
+                    versions.append(source.version(spreadsheet)[0])
+                except Exception:
+                    versions.append(None)
+            return versions[0]
+
+    def read(tab):
+        if store is not None and store.has(tab):
+            version = current_version()
+            if version is not None and version == store.manifest['version']:
+                return {tab: store.read(tab)}
+        return source.fetch_tabs([tab], spreadsheet)
+
+    return read
+
+
+def submit_tabs(source, tabs, spreadsheet=SPREADSHEET_NAME, timeout=TAB_TIMEOUT):
+    """Start every cache miss now, one task per tab, and return {tab: Future of TabResult}.
+
+    Unlike load_tabs nothing is batched, so callers can use each tab as soon
+    as it arrives instead of waiting for the slowest one. Tabs are not synced
+    into the snapshot here; the caller stores them once they are all in.
+    """
+    read = _tab_reader(source, spreadsheet)
+    futures = {}
+    for item in tabs:
+        book, tab = _spec(item, spreadsheet)
+        frame = TAB_CACHE.get((book, tab))
+        if frame is not None:
+            futures[item] = Future()
+            futures[item].set_result(TabResult(tab, book, 'cached', frame, None, 0, 0.0))
+        else:
+            reader = read if book == spreadsheet else _tab_reader(source, book)
+            futures[item] = _executor.submit(_fetch_one, source, book, tab, timeout, reader)
+    return futures
+
+
+def wait_tabs(futures, spreadsheet=SPREADSHEET_NAME, timeout=TAB_TIMEOUT):
+    """{tab: TabResult} once every future from submit_tabs is done or the wait times out."""
+    waves = math.ceil(len(futures) / MAX_WORKERS)
+    wait(list(futures.values()), timeout=timeout * waves)
+    results = {}
+    for item, future in futures.items():
+        book, tab = _spec(item, spreadsheet)
+        results[item] = future.result() if future.done() else TabResult(tab, book, 'timeout', None, None, 0, timeout * waves)
+    return results
+
+
+def load_tab(source, tab, spreadsheet=SPREADSHEET_NAME, timeout=TAB_TIMEOUT):
+    """Cached read of one worksheet; hits Sheets at most once per TTL window."""
+    return load_tabs(source, [tab], spreadsheet, batch=False, timeout=timeout)[tab]
@@ -0,0 +1,102 @@
+"""Folium map of the Pourashavas, built from whole columns at once.
+
+All points go to the browser as one JSON array inside a FastMarkerCluster,
+and markers, tooltips and grade colours are created client-side by a small
+JavaScript callback. Build time and HTML size therefore grow with the raw
+data only, not with one Python Marker/Icon/Popup object per point.
+"""
+import hashlib
+import json
+import logging
+import os
+
+import folium
+import pandas as pd
+from folium.plugins import FastMarkerCluster
+
+from iugip.cache import TTLCache
+from iugip.profiling import stage
+
+logger = logging.getLogger(__name__)
+
+# Marker colors for each grade value
+GRADE_COLORS = {'A+': 'darkgreen', 'A': 'lightgreen', 'B': 'lightblue', 'C': 'gray', 'D': 'lightgray'}
+
+# Map centered on Bangladesh
+MAP_CENTER = [23.6850, 90.3563]
+MAP_ZOOM = 7
+
+# Size of the map frame, as folium_static used it
+MAP_WIDTH = 700
+MAP_HEIGHT = 500
+
+# Columns that feed the map; the rendered HTML only changes when these do
+MAP_COLUMNS = ['Pourashava', 'Lat', 'Lon', 'Total Score', 'Grade']
+
+# Rendered map HTML by data hash and options, least recently used evicted first
+MAP_CACHE = TTLCache(
+    ttl=None,
+    max_entries=int(os.environ.get('IUGIP_MAP_CACHE_ENTRIES', 16)),
+    max_bytes=int(float(os.environ.get('IUGIP_MAP_CACHE_MB', 64)) * 1024 * 1024),
+)
+
+# Up to this many points every marker is shown on its own, as before clustering
+CLUSTER_MIN_POINTS = 200
+
+# row = [lat, lon, name, score, grade]
+_MARKER_CALLBACK = """
+function (row) {
+    var colors = %s;
+    var icon = L.AwesomeMarkers.icon({markerColor: colors[row[4]] || 'black', icon: 'info-sign', prefix: 'glyphicon'});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindTooltip(String(row[2]));
+    marker.bindPopup(row[2] + '<br>Score: ' + row[3] + '<br>Grade: ' + row[4]);
+    return marker;
+}
+"""
+
+
+def map_points(df):
+    """[lat, lon, name, score, grade] rows for every Pourashava with valid coordinates."""
+    # Columns are already typed at ingest (float64 coordinates, float32 scores)
+    points = pd.DataFrame({
+        'lat': df['Lat'],
+        'lon': df['Lon'],
+        'name': df['Pourashava'].astype(str),
+        'score': df['Total Score'].astype('float64').round(2),
+        'grade': df['Grade'].astype(str),
+    }).dropna(subset=['lat', 'lon'])
+    return points.values.tolist()
+
+
+def build_map(df, grade_colors=GRADE_COLORS, location=MAP_CENTER, zoom_start=MAP_ZOOM):
+    m = folium.Map(location=location, zoom_start=zoom_start)
+    points = map_points(df)
+
+    options = {}
+    if len(points) <= CLUSTER_MIN_POINTS:
+        options['disableClusteringAtZoom'] = 1
+    FastMarkerCluster(points, callback=_MARKER_CALLBACK % json.dumps(grade_colors), options=options).add_to(m)
+    return m
+
+
+def map_key(df, **options):
+    """Hash of the mapped columns plus the map options."""
+    digest = hashlib.sha1(json.dumps(options, sort_keys=True, default=str).encode())
+    digest.update(pd.util.hash_pandas_object(df[MAP_COLUMNS], index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def render_map_html(df, grade_colors=GRADE_COLORS, location=MAP_CENTER, zoom_start=MAP_ZOOM):
+    """Standalone map HTML, rebuilt only when the data or options change."""
+    key = map_key(df, grade_colors=grade_colors, location=location, zoom_start=zoom_start)
+
+    def render():
+        with stage('map.build', points=len(df)):
+            m = build_map(df, grade_colors, location, zoom_start)
+        with stage('map.render'):
+            html = folium.Figure().add_child(m).render()
+        logger.info('Rendered map %s (%d bytes); cache %s', key[:12], len(html), MAP_CACHE.stats())
+        return html
+
+    return MAP_CACHE.get_or_load(key, render)
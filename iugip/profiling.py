@@ -0,0 +1,106 @@
+"""Lightweight timing of the hot path: auth, Sheets I/O, ingest, charts and Streamlit.
+
+Each stage is timed with ``with stage('name'):`` and logged as one JSON line
+on the 'iugip.timing' logger. The last WINDOW durations of every stage are
+kept in memory for rolling p50/p95, next to counters of Sheets and Drive
+calls. Everything is process-wide, like the caches, so the admin panel shows
+the whole process rather than one session.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+
+WINDOW = int(os.environ.get('IUGIP_TIMING_WINDOW', 200))
+
+logger = logging.getLogger('iugip.timing')
+
+# Streamlit only configures its own loggers; give the JSON lines a bare handler
+# unless IUGIP_TIMING_LOG=0
+if os.environ.get('IUGIP_TIMING_LOG', '1') != '0' and not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile of a non-empty sequence, q in 0-100."""
+    ordered = sorted(samples)
+    rank = max(1, int(-(-q * len(ordered) // 100)))
+    return ordered[rank - 1]
+
+
+class Profiler:
+    """Rolling per-stage durations and call counters, safe to use from any thread."""
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}  # stage -> deque of recent ms
+        self._totals = Counter()  # stage -> runs since start
+        self._calls = Counter()
+        self._local = threading.local()
+
+    def begin_run(self, **fields):
+        """Tag every stage timed on this thread from now on, e.g. with the page shown."""
+        self._local.run = dict(fields, run=uuid.uuid4().hex[:8])
+
+    def record(self, name, ms, **fields):
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(ms)
+            self._totals[name] += 1
+        if logger.isEnabledFor(logging.INFO):
+            entry = {'ts': round(time.time(), 3), 'stage': name, 'ms': round(ms, 2)}
+            entry.update(getattr(self._local, 'run', {}))
+            entry.update(fields)
+            logger.info(json.dumps(entry, default=str))
+
+    @contextmanager
+    def stage(self, name, **fields):
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as exc:
+            fields['error'] = type(exc).__name__
+            raise
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000, **fields)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self._calls[name] += n
+
+    def calls(self):
+        with self._lock:
+            return dict(self._calls)
+
+    def summary(self):
+        """{stage: {'runs', 'p50', 'p95', 'last'}} over the rolling window, in ms."""
+        with self._lock:
+            samples = {name: list(values) for name, values in self._samples.items()}
+            totals = dict(self._totals)
+        return {
+            name: {'runs': totals[name], 'p50': percentile(values, 50), 'p95': percentile(values, 95), 'last': values[-1]}
+            for name, values in sorted(samples.items())
+        }
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+            self._calls.clear()
+
+
+PROFILER = Profiler()
+
+stage = PROFILER.stage
+count = PROFILER.count
@@ -0,0 +1,215 @@
+"""Background worker that keeps the dashboard data warm off the request path.
+
+The worker polls the spreadsheet's Drive version on a schedule. When it
+moves, the tabs are reloaded through the loader and a new DataVersion is
+swapped in with a single reference assignment, so script runs only ever see
+complete data. When the source is down the last good version keeps being
+served; a cold process falls back to the local Parquet snapshot.
+"""
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+
+from iugip.data import DataVersion
+from iugip.loader import TAB_CACHE, load_tabs, submit_tabs, wait_tabs
+from iugip.profiling import stage
+from iugip.sheets import DASHBOARD_TABS, SPREADSHEET_NAME
+from iugip.snapshot import snapshot_store
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL = float(os.environ.get('IUGIP_REFRESH_INTERVAL', 60))
+
+RefreshStatus = namedtuple('RefreshStatus', [
+    'last_check', 'last_refresh', 'duration', 'failures', 'consecutive_failures', 'last_error', 'version',
+])
+
+
+class Refresher:
+    """Polls for spreadsheet changes and publishes new DataVersions."""
+
+    def __init__(self, source, spreadsheet=SPREADSHEET_NAME, tabs=DASHBOARD_TABS, interval=REFRESH_INTERVAL):
+        self.source = source
+        self.spreadsheet = spreadsheet
+        self.tabs = list(tabs)
+        self.interval = interval
+        self._current = None
+        self._loading = None
+        self._loading_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._status = RefreshStatus(None, None, None, 0, 0, None, None)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='iugip-refresher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    def status(self):
+        return self._status
+
+    def current(self, wait=True):
+        """The latest DataVersion; on a cold process, optionally load it now."""
+        if self._current is None and wait:
+            self.refresh()
+        return self._current
+
+    def loading(self):
+        """{tab: Future of TabResult} of the first load, started now if need be; None once data is ready.
+
+        Pages can render each tab as it arrives instead of waiting for the
+        whole DataVersion; the refresher builds that from the same futures.
+        """
+        with self._loading_lock:
+            if self._current is not None:
+                return None
+            if self._loading is None:
+                self._loading = submit_tabs(self.source, self.tabs, self.spreadsheet)
+            return self._loading
+
+    def _changed(self, force):
+        # Returns the Drive version when a reload is needed, or False when nothing moved
+        store = snapshot_store(self.spreadsheet) if self.source.snapshots else None
+        # The first load reads tab by tab (see loading()) and updates the snapshot afterwards
+        if store is not None and self._current is not None:
+            changed = store.sync(self.source, self.tabs, force=force, max_age=0)
+            for tab in changed:
+                TAB_CACHE.invalidate((self.spreadsheet, tab))
+            version = store.manifest['version'], store.manifest['modified_time']
+            # A snapshot served during an outage is replaced as soon as the source answers again
+            reload = force or changed or self._current is None or self._current.stale
+        else:
+            version = self.source.version(self.spreadsheet)
+            reload = force or self._current is None or version[0] != self._current.version
+            if reload:
+                for tab in self.tabs:
+                    TAB_CACHE.invalidate((self.spreadsheet, tab))
+        return version if reload else False
+
+    def refresh(self, force=False):
+        """Run one poll; concurrent callers wait for the refresh already running."""
+        if not self._refresh_lock.acquire(blocking=False):
+            # Someone else is refreshing; wait for it instead of fetching again
+            with self._refresh_lock:
+                return self._current
+        try:
+            return self._refresh(force)
+        finally:
+            self._refresh_lock.release()
+
+    def _last_good(self):
+        # The on-disk snapshot, for a process that has never reached the source
+        store = snapshot_store(self.spreadsheet) if self.source.snapshots else None
+        if store is None or not store.has('Overview'):
+            return None
+        manifest = store.manifest
+        frames = {tab: store.read(tab) for tab in self.tabs if store.has(tab)}
+        errors = {tab: 'not in snapshot' for tab in self.tabs if tab not in frames}
+        # The last time the snapshot was confirmed to match the spreadsheet
+        as_of = manifest['checked_at'] or max(entry['written_at'] for entry in manifest['tabs'].values())
+        logger.warning('Serving the local snapshot from %s', time.ctime(as_of))
+        return DataVersion(frames, manifest['version'], manifest['modified_time'], errors, as_of=as_of, stale=True)
+
+    def staleness(self):
+        """Banner text when the data shown may be out of date, else None."""
+        data, status = self._current, self._status
+        if data is None or not (data.stale or status.consecutive_failures):
+            return None
+        minutes = (time.time() - data.as_of) / 60
+        message = 'Showing data from {} ({:.0f} min ago): the spreadsheet could not be reached'.format(
+            time.strftime('%Y-%m-%d %H:%M', time.localtime(data.as_of)), minutes)
+        breaker = getattr(self.source, 'breaker', None)
+        if breaker is not None and breaker.retry_in():
+            message += ', next try in {:.0f}s'.format(breaker.retry_in())
+        return message + '.'
+
+    def _refresh(self, force):
+        started = time.time()
+        status = self._status
+        try:
+            with stage('refresh.check'):
+                version = self._changed(force)
+            if version is False:
+                self._status = status._replace(last_check=started, consecutive_failures=0)
+                return self._current
+
+            with stage('refresh.load', tabs=len(self.tabs)):
+                if self._current is None:
+                    # First load: one task per tab, shared with pages rendering progressively
+                    try:
+                        results = wait_tabs(self.loading(), self.spreadsheet)
+                    finally:
+                        with self._loading_lock:
+                            self._loading = None
+                    store = snapshot_store(self.spreadsheet) if self.source.snapshots else None
+                    loaded = {tab: result.frame for tab, result in results.items() if result.frame is not None}
+                    # Only a complete load may claim the Drive version; otherwise the next sync re-reads it all
+                    if store is not None and len(loaded) == len(results):
+                        store.update(version[0], version[1], loaded)
+                else:
+                    results = load_tabs(self.source, self.tabs, self.spreadsheet)
+
+            # Tabs that failed keep their previous frame, if there is one
+            frames = dict(self._current.frames) if self._current is not None else {}
+            errors = {}
+            for tab, result in results.items():
+                if result.frame is not None:
+                    frames[tab] = result.frame
+                else:
+                    errors[tab] = result.status
+            if 'Overview' not in frames:
+                raise RuntimeError('Overview tab could not be loaded ({})'.format(errors.get('Overview')))
+
+            with stage('refresh.ingest'):
+                self._current = DataVersion(frames, version[0], version[1], errors)
+            self._status = status._replace(
+                last_check=started,
+                last_refresh=time.time(),
+                duration=time.time() - started,
+                consecutive_failures=0,
+                last_error='; '.join('{}: {}'.format(tab, error) for tab, error in errors.items()) or None,
+                version=version[0],
+            )
+        except Exception as exc:
+            logger.exception('Dashboard data refresh failed')
+            self._status = status._replace(
+                last_check=started,
+                failures=status.failures + 1,
+                consecutive_failures=status.consecutive_failures + 1,
+                last_error=repr(exc),
+            )
+            if self._current is None:
+                # Start the next first load afresh rather than from these tasks
+                with self._loading_lock:
+                    self._loading = None
+                try:
+                    self._current = self._last_good()
+                except Exception:
+                    logger.exception('Local snapshot could not be read')
+        return self._current
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def start_refresher(source):
+    """The process-wide refresher, started on first use."""
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = Refresher(source)
+        return _refresher.start()
@@ -0,0 +1,186 @@
+"""Write a static report for every Pourashava, without Streamlit.
+
+Data is loaded once in the parent process, either live from Google Sheets
+(credentials from GOOGLE_APPLICATION_CREDENTIALS, or another backend chosen
+by IUGIP_DATA_SOURCE) or offline from a local Parquet snapshot, and handed
+to each worker process once through the pool initializer. Workers reuse the
+dashboard's figure and table builders:
+
+    python -m iugip.report --out reports --snapshot .snapshots
+    python -m iugip.report --out reports --format html png --workers 8
+"""
+import argparse
+import html
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from iugip.data import DataVersion
+from iugip.figures import performance_figure
+from iugip.sheets import DASHBOARD_TABS, SPREADSHEET_NAME
+from iugip.snapshot import SnapshotStore, safe_name
+from iugip.tables import indicator_table
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ['html', 'png', 'pdf']
+
+_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; max-width: 1200px; margin: auto; }}
+table {{ border-collapse: collapse; }}
+td, th {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def load_snapshot(root, spreadsheet=SPREADSHEET_NAME):
+    """Frames for every tab in a local snapshot directory; no network access."""
+    store = SnapshotStore(root, spreadsheet)
+    tabs = [tab for tab in DASHBOARD_TABS if store.has(tab)]
+    if 'Overview' not in tabs:
+        raise SystemExit('No Overview tab in snapshot {}'.format(store.path))
+    return DataVersion({tab: store.read(tab) for tab in tabs}, store.manifest['version'], store.manifest['modified_time'])
+
+
+def load_live(spreadsheet=SPREADSHEET_NAME):
+    from iugip.loader import load_tabs
+    from iugip.sources import get_source
+
+    results = load_tabs(get_source(), DASHBOARD_TABS, spreadsheet)
+    errors = {tab: result.status for tab, result in results.items() if result.frame is None}
+    if 'Overview' in errors:
+        raise SystemExit('Could not load the Overview tab ({})'.format(errors['Overview']))
+    frames = {tab: result.frame for tab, result in results.items() if result.frame is not None}
+    return DataVersion(frames, errors=errors)
+
+
+def file_name(name):
+    return safe_name(name).strip('_') or 'pourashava'
+
+
+# Set once per worker process by the pool initializer
+_data = None
+_options = None
+
+
+def _init_worker(data, options):
+    global _data, _options
+    _data, _options = data, options
+
+
+def render_report(name, data, out, formats, plotlyjs):
+    """Write the report files for one Pourashava and return their paths."""
+    row = data.wide.loc[name]
+    aggregates = data.aggregates
+    fig = performance_figure(row, 'Performance Comparison for ' + str(name))
+
+    paths = []
+    base = os.path.join(out, file_name(name))
+    if 'html' in formats:
+        rank = aggregates.ranks.loc[name, 'Total Score']
+        percentile = aggregates.percentiles.loc[name, 'Total Score']
+        summary = '<p>Total Score: <b>{:g}</b> &middot; Grade: <b>{}</b> &middot; Rank: {:g} of {} &middot; Percentile: {:.0f}</p>'.format(
+            float(row['Total Score']), html.escape(str(row['Grade'])), rank, len(data.pourashavas), percentile)
+        body = '\n'.join([
+            '<h1>{}</h1>'.format(html.escape(str(name))),
+            summary,
+            fig.to_html(full_html=False, include_plotlyjs=plotlyjs),
+            '<h2>Indicators</h2>',
+            indicator_table(data.wide, [name], skip_tabs=list(data.errors)).to_html(index=False, border=0),
+        ])
+        with open(base + '.html', 'w', encoding='utf-8') as f:
+            f.write(_PAGE.format(title=html.escape(str(name)), body=body))
+        paths.append(base + '.html')
+    for fmt in formats:
+        if fmt != 'html':
+            # Static images need the optional kaleido package
+            fig.write_image(base + '.' + fmt, width=1200, height=700)
+            paths.append(base + '.' + fmt)
+    return paths
+
+
+def _work(name):
+    try:
+        return name, render_report(name, _data, **_options), None
+    except Exception as exc:
+        return name, [], repr(exc)
+
+
+def write_index(data, out, reports):
+    rows = []
+    # Best first, linking every Pourashava that got an HTML report
+    for name in data.aggregates.ranks['Total Score'].sort_values(kind='mergesort').index:
+        link = next((os.path.basename(path) for path in reports.get(name, []) if path.endswith('.html')), '')
+        row = data.wide.loc[name]
+        rows.append('<tr><td><a href="{}">{}</a></td><td>{:g}</td><td>{}</td></tr>'.format(
+            html.escape(link), html.escape(str(name)), float(row['Total Score']), html.escape(str(row['Grade']))))
+    body = '<h1>UGIAP Pourashava reports</h1>\n<table><tr><th>Pourashava</th><th>Total Score</th><th>Grade</th></tr>\n{}\n</table>'.format('\n'.join(rows))
+    path = os.path.join(out, 'index.html')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(_PAGE.format(title='UGIAP Pourashava reports', body=body))
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write a static report for every Pourashava.')
+    parser.add_argument('--out', default='reports', help='output directory')
+    parser.add_argument('--snapshot', help='read data from this snapshot directory instead of Google Sheets')
+    parser.add_argument('--format', nargs='+', choices=FORMATS, default=['html'], dest='formats')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes')
+    parser.add_argument('--pourashava', nargs='+', help='only these Pourashavas')
+    parser.add_argument('--plotlyjs', choices=['directory', 'cdn', 'inline'], default='directory',
+                        help='how HTML reports load plotly.js (directory writes one shared copy)')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(message)s')
+
+    if set(args.formats) - {'html'}:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            parser.error('PNG/PDF output needs the kaleido package (pip install kaleido)')
+
+    started = time.perf_counter()
+    data = load_snapshot(args.snapshot) if args.snapshot else load_live()
+    names = args.pourashava or data.pourashavas
+    unknown = [name for name in names if name not in data.wide.index]
+    if unknown:
+        parser.error('unknown Pourashava: ' + ', '.join(unknown))
+    logger.info('Loaded %d Pourashavas in %.1fs', len(data.pourashavas), time.perf_counter() - started)
+
+    os.makedirs(args.out, exist_ok=True)
+    if 'html' in args.formats and args.plotlyjs == 'directory':
+        from plotly.offline import get_plotlyjs
+        with open(os.path.join(args.out, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+
+    options = {'out': args.out, 'formats': args.formats, 'plotlyjs': args.plotlyjs}
+    reports, failed = {}, {}
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(data, options)) as pool:
+        for future in as_completed([pool.submit(_work, name) for name in names]):
+            name, paths, error = future.result()
+            if error:
+                failed[name] = error
+                logger.error('%s: %s', name, error)
+            else:
+                reports[name] = paths
+
+    if 'html' in args.formats:
+        write_index(data, args.out, reports)
+    logger.info('Wrote %d reports to %s in %.1fs (%d failed)', len(reports), args.out, time.perf_counter() - started, len(failed))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""Circuit breaker and single-flight around the upstream data source.
+
+During a Sheets outage or quota exhaustion every session would otherwise
+keep calling the API and waiting out its timeouts. ResilientSource wraps any
+DataSource so that:
+
+* identical concurrent calls share one upstream request (single-flight);
+* after FAILURE_THRESHOLD consecutive outage errors the circuit opens and
+  calls fail at once with CircuitOpenError for RESET_TIMEOUT seconds, after
+  which one trial call is let through to probe the source.
+
+Callers keep serving the last good data meanwhile; see Refresher.
+"""
+import os
+import threading
+import time
+
+from google.auth.exceptions import GoogleAuthError
+
+from iugip.loader import is_retryable
+from iugip.profiling import count
+from iugip.sheets import SPREADSHEET_NAME
+from iugip.sources import DataSource
+
+FAILURE_THRESHOLD = int(os.environ.get('IUGIP_BREAKER_FAILURES', 5))
+RESET_TIMEOUT = float(os.environ.get('IUGIP_BREAKER_RESET', 60))
+# Longest a caller waits for an identical call already in flight
+FLIGHT_TIMEOUT = float(os.environ.get('IUGIP_FLIGHT_TIMEOUT', 30))
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a source whose circuit is open."""
+
+
+def is_outage(exc):
+    """Errors that say the source is unavailable, as opposed to a bad request."""
+    return is_retryable(exc) or isinstance(exc, GoogleAuthError)
+
+
+class CircuitBreaker:
+    """Closed, open or half-open, counted over consecutive outage errors."""
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT, is_failure=is_outage):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+        self.last_error = None
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            return 'half-open' if time.monotonic() - self._opened_at >= self.reset_timeout else 'open'
+
+    def retry_in(self):
+        """Seconds until a trial call is allowed, 0 when calls go through."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def _before(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial:
+                count('breaker.rejected')
+                raise CircuitOpenError('Data source unavailable ({}); retrying in {:.0f}s'.format(
+                    self.last_error, max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))))
+            # Half-open: this caller probes the source, everyone else keeps failing fast
+            self._trial = True
+
+    def _after(self, exc):
+        with self._lock:
+            self._trial = False
+            if exc is None:
+                self._failures = 0
+                self._opened_at = None
+                return
+            if not self.is_failure(exc):
+                return
+            self._failures += 1
+            self.last_error = repr(exc)
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                # A failed probe re-opens for another full timeout
+                if self._opened_at is None:
+                    count('breaker.opened')
+                self._opened_at = time.monotonic()
+
+    def call(self, fn, *args, **kwargs):
+        self._before()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as exc:
+            self._after(exc)
+            raise
+        self._after(None)
+        return result
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs one call per key at a time; concurrent callers with the same key share its outcome.
+
+    Followers give up after timeout seconds with a TimeoutError, which the
+    loader retries like any other connection error, so one hung call cannot
+    hold up every later caller.
+    """
+
+    def __init__(self, timeout=FLIGHT_TIMEOUT):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            count('singleflight.shared')
+            if not call.done.wait(self.timeout):
+                count('singleflight.timeout')
+                raise TimeoutError('Gave up after {:.0f}s waiting for the same call in flight: {!r}'.format(self.timeout, key))
+        else:
+            try:
+                call.result = fn(*args, **kwargs)
+            except Exception as exc:
+                call.error = exc
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+class ResilientSource(DataSource):
+    """A DataSource behind a circuit breaker, with concurrent identical calls coalesced."""
+
+    def __init__(self, source, breaker=None):
+        self.source = source
+        self.name = source.name
+        self.snapshots = source.snapshots
+        self.breaker = breaker or CircuitBreaker()
+        self._flights = SingleFlight()
+
+    def _call(self, key, fn, *args):
+        return self._flights.do(key, self.breaker.call, fn, *args)
+
+    def version(self, spreadsheet=SPREADSHEET_NAME):
+        return self._call(('version', spreadsheet), self.source.version, spreadsheet)
+
+    def fetch_tabs(self, tabs, spreadsheet=SPREADSHEET_NAME):
+        return self._call(('tabs', spreadsheet, tuple(tabs)), self.source.fetch_tabs, tabs, spreadsheet)
+
+    def fetch_tab(self, tab, spreadsheet=SPREADSHEET_NAME):
+        return self._call(('tab', spreadsheet, tab), self.source.fetch_tab, tab, spreadsheet)
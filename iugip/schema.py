@@ -0,0 +1,104 @@
+"""Declared column types for every tab, with vectorized coercion and checks.
+
+Sheets hands back object columns mixing numbers and text. coerce() turns
+each tab into compact typed columns once, at ingest: categories for
+Pourashava, Grade and indicator statuses, float32 scores, int8 max scores
+and float64 coordinates. validate() then range-checks the typed frame.
+"""
+import pandas as pd
+
+from iugip.areas import AREAS, AREA_COLUMNS
+
+GRADES = ['A+', 'A', 'B', 'C', 'D']
+GRADE_DTYPE = pd.CategoricalDtype(GRADES, ordered=True)
+
+# Rough bounding box of Bangladesh, for catching swapped or mistyped coordinates
+LAT_RANGE = (20.0, 27.0)
+LON_RANGE = (88.0, 93.0)
+
+MAX_TOTAL_SCORE = sum(area.max_score for area in AREAS)
+
+OVERVIEW_SCHEMA = {
+    'Pourashava': 'category',
+    'Grade': GRADE_DTYPE,
+    'Lat': 'float64',
+    'Lon': 'float64',
+    'Total Score': 'float32',
+}
+OVERVIEW_SCHEMA.update({column: 'float32' for column in AREA_COLUMNS})
+OVERVIEW_SCHEMA.update({column + ' Max Score': 'int8' for column in AREA_COLUMNS})
+
+SCHEMAS = {'Overview': OVERVIEW_SCHEMA}
+for area in AREAS:
+    SCHEMAS[area.tab] = dict({'Pourashava': 'category'}, **{column: 'category' for column in area.indicators})
+
+
+def _text(series):
+    # Blank cells arrive as 0 (empty2zero) next to text; keep them all as text
+    return series.astype(str).str.strip()
+
+
+def coerce(tab, frame):
+    """Return frame with the tab's declared dtypes; unknown columns are left as they are.
+
+    A frame that already has them is returned as it is, not copied, so
+    memory-mapped frames keep sharing their buffers (see iugip.shared).
+    """
+    schema = SCHEMAS.get(tab)
+    if schema is None:
+        return frame
+    pending = {column: dtype for column, dtype in schema.items() if column in frame.columns and frame[column].dtype != dtype}
+    if not pending:
+        return frame
+    frame = frame.copy()
+    for column, dtype in pending.items():
+        if dtype in ('float32', 'float64'):
+            frame[column] = pd.to_numeric(frame[column], errors='coerce').astype(dtype)
+        elif dtype == 'int8':
+            values = pd.to_numeric(frame[column], errors='coerce')
+            # A blank or non-numeric max score cannot be an int8; keep it as a float NaN
+            frame[column] = values.astype('int8') if values.notna().all() else values.astype('float32')
+        elif dtype is GRADE_DTYPE:
+            frame[column] = _text(frame[column]).astype(GRADE_DTYPE)
+        else:
+            frame[column] = _text(frame[column]).astype('category')
+    return frame
+
+
+def validate(tab, frame):
+    """List of human-readable problems found in a coerced tab."""
+    issues = []
+    schema = SCHEMAS.get(tab, {})
+    missing = [column for column in schema if column not in frame.columns]
+    if missing:
+        issues.append('missing columns: ' + ', '.join(missing))
+
+    def report(mask, message):
+        names = frame.loc[mask, 'Pourashava'].astype(str).tolist() if 'Pourashava' in frame.columns else []
+        if len(names):
+            issues.append('{} ({})'.format(message, ', '.join(names)))
+
+    if tab != 'Overview':
+        return issues
+
+    if 'Grade' in frame.columns:
+        report(frame['Grade'].isna(), 'grade not one of ' + '/'.join(GRADES))
+    for column, (low, high) in (('Lat', LAT_RANGE), ('Lon', LON_RANGE)):
+        if column in frame.columns:
+            report(~frame[column].between(low, high), '{} outside {}-{}'.format(column, low, high))
+
+    for area in AREAS:
+        column, max_column = area.column, area.column + ' Max Score'
+        if column not in frame.columns:
+            continue
+        scores = frame[column]
+        limit = frame[max_column] if max_column in frame.columns else area.max_score
+        report(scores.isna(), '{} score is not a number'.format(column))
+        report((scores < 0) | (scores > limit), '{} score outside 0-max score'.format(column))
+        if max_column in frame.columns:
+            report(frame[max_column] != area.max_score, '{} differs from {}'.format(max_column, area.max_score))
+
+    if 'Total Score' in frame.columns:
+        total = frame['Total Score']
+        report(total.isna() | (total < 0) | (total > MAX_TOTAL_SCORE), 'Total Score outside 0-{}'.format(MAX_TOTAL_SCORE))
+    return issues
@@ -0,0 +1,189 @@
+"""Score every Pourashava from its indicator statuses, independently of the sheet formulas.
+
+A rubric gives the full points of each indicator, the share of those points
+each status earns, and the Total Score needed for each grade. The official
+one is read from the JSON file named by IUGIP_RUBRIC (see load_rubric() and
+rubric.example.json); until it is set the app shows no recomputed scores
+and What-if cannot change indicator statuses. The values below are
+placeholders that the synthetic fixtures are generated with.
+
+score() turns the indicator columns of the Pourashava-indexed table into one
+float32 matrix, then gets every area score with a single matrix product, so
+thousands of Pourashavas are scored in milliseconds. compare() lists where
+the result disagrees with the 'Overview' tab.
+"""
+import json
+import os
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from iugip.areas import AREAS
+from iugip.schema import GRADE_DTYPE, GRADES
+
+# Placeholder rubric: share of an indicator's full points earned by each status (matched ignoring case)
+STATUS_POINTS = {
+    'yes': 1.0,
+    'partially': 0.5,
+    'partial': 0.5,
+    'no': 0.0,
+    # Nothing was due yet, so nothing can be missing
+    'not due': 1.0,
+}
+
+# Cell values that mean "not filled in"; blank cells arrive as 0 with empty2zero
+BLANK = {'', '0', 'nan', 'none'}
+
+# Full points of individual indicators; the others share what is left of their
+# area's max score equally
+INDICATOR_POINTS = {}
+
+# Lowest Total Score for each grade, best first
+GRADE_BANDS = [(90, 'A+'), (80, 'A'), (70, 'B'), (60, 'C'), (0, 'D')]
+
+# Difference from the sheet that still counts as the same score
+TOLERANCE = 0.01
+
+# 'sheet' shows the Overview tab's own scores, 'computed' replaces them with score();
+# without a configured rubric the sheet's scores are always shown
+SCORE_SOURCE = os.environ.get('IUGIP_SCORE_SOURCE', 'sheet')
+
+# JSON file holding the official rubric; empty means none is configured
+RUBRIC_PATH = os.environ.get('IUGIP_RUBRIC', '')
+
+# status_points and bands as STATUS_POINTS and GRADE_BANDS; points as INDICATOR_POINTS
+Rubric = namedtuple('Rubric', ['status_points', 'points', 'bands'])
+
+# What the fixtures are scored with; never the basis of anything shown for the real sheet
+DEFAULT_RUBRIC = Rubric(STATUS_POINTS, INDICATOR_POINTS, GRADE_BANDS)
+
+# scores: Pourashava-indexed area columns, 'Total Score' and 'Grade'
+# unscored: indicators per Pourashava left blank; unknown: indicator -> statuses not in STATUS_POINTS
+Scores = namedtuple('Scores', ['scores', 'unscored', 'unknown'])
+
+
+def load_rubric(path):
+    """Rubric from a JSON file.
+
+    'status_points' maps each status to the share of full points it earns and
+    'grade_bands' lists [lowest Total Score, grade] pairs; both are required.
+    'indicator_points' is optional: indicators not in it share what is left of
+    their area's max score equally.
+    """
+    with open(path) as f:
+        spec = json.load(f)
+    missing = [key for key in ('status_points', 'grade_bands') if key not in spec]
+    if missing:
+        raise ValueError('{}: missing {}'.format(path, ', '.join(missing)))
+
+    status_points = {str(status).strip().casefold(): float(share) for status, share in spec['status_points'].items()}
+    points = {str(indicator): float(value) for indicator, value in spec.get('indicator_points', {}).items()}
+    known = {indicator for area in AREAS for indicator in area.indicators}
+    unknown = sorted(set(points) - known)
+    if unknown:
+        raise ValueError('{}: unknown indicators {}'.format(path, ', '.join(unknown)))
+    bands = sorted(((float(low), str(name)) for low, name in spec['grade_bands']), reverse=True)
+    unknown = sorted({name for _, name in bands} - set(GRADES))
+    if unknown:
+        raise ValueError('{}: unknown grades {}'.format(path, ', '.join(unknown)))
+    return Rubric(status_points, points, bands)
+
+
+_rubric = []
+_rubric_lock = threading.Lock()
+
+
+def rubric():
+    """The configured rubric, read once; None when IUGIP_RUBRIC is not set."""
+    with _rubric_lock:
+        if not _rubric:
+            _rubric.append(load_rubric(RUBRIC_PATH) if RUBRIC_PATH else None)
+        return _rubric[0]
+
+
+def indicator_points(areas=AREAS, points=INDICATOR_POINTS):
+    """Full points of every indicator, in AREAS order."""
+    values = []
+    for area in areas:
+        fixed = {indicator: points[indicator] for indicator in area.indicators if indicator in points}
+        free = [indicator for indicator in area.indicators if indicator not in fixed]
+        share = (area.max_score - sum(fixed.values())) / len(free) if free else 0.0
+        values.extend(fixed.get(indicator, share) for indicator in area.indicators)
+    return np.array(values, dtype='float32')
+
+
+def grade(total, bands=GRADE_BANDS):
+    """Grade of each Total Score, as the ordered grade categorical."""
+    lows = np.array([low for low, _ in bands][::-1], dtype='float64')
+    names = np.array([name for _, name in bands][::-1], dtype=object)
+    total = np.asarray(total, dtype='float64')
+    index = np.searchsorted(lows, total, side='right') - 1
+    grades = np.where((index >= 0) & ~np.isnan(total), names[index.clip(0)], None)
+    return pd.Categorical(grades, dtype=GRADE_DTYPE)
+
+
+def _shares(column, status_points):
+    # Look statuses up once per category, then spread them to the rows by code
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        column = column.astype(str).str.strip().astype('category')
+    keys = [str(value).strip().casefold() for value in column.cat.categories]
+    lookup = np.array([status_points.get(key, np.nan) for key in keys] + [np.nan], dtype='float32')
+    unknown = [value for value, key in zip(column.cat.categories, keys) if key not in status_points and key not in BLANK]
+    # Code -1 (missing) picks the trailing NaN
+    return lookup[column.cat.codes.to_numpy()], unknown
+
+
+def score(wide, areas=AREAS, status_points=STATUS_POINTS, points=INDICATOR_POINTS, bands=GRADE_BANDS):
+    """Area scores, Total Score and Grade for every row of the Pourashava-indexed table."""
+    indicators = [indicator for area in areas for indicator in area.indicators]
+    statuses = wide.reindex(columns=indicators)
+
+    shares = np.empty((len(wide), len(indicators)), dtype='float32')
+    unknown = {}
+    for position, indicator in enumerate(indicators):
+        shares[:, position], values = _shares(statuses[indicator], status_points)
+        if values:
+            unknown[indicator] = values
+
+    # Indicator -> area membership, so one product sums every area at once
+    membership = np.zeros((len(indicators), len(areas)), dtype='float32')
+    start = 0
+    for position, area in enumerate(areas):
+        membership[start:start + len(area.indicators), position] = 1
+        start += len(area.indicators)
+
+    earned = np.nan_to_num(shares) * indicator_points(areas, points)
+    area_scores = earned @ membership
+
+    scores = pd.DataFrame(area_scores, index=wide.index, columns=[area.column for area in areas])
+    scores['Total Score'] = area_scores.sum(axis=1)
+    scores['Grade'] = grade(scores['Total Score'], bands)
+    unscored = pd.Series(np.isnan(shares).sum(axis=1), index=wide.index, name='Unscored')
+    return Scores(scores, unscored, unknown)
+
+
+def compare(computed, sheet, tolerance=TOLERANCE):
+    """Long frame of Pourashava, Column, Sheet and Computed wherever the two disagree."""
+    sheet = sheet.reindex(computed.index)
+    parts = []
+    for column in computed.columns:
+        if column not in sheet.columns:
+            continue
+        ours, theirs = computed[column], sheet[column]
+        if column == 'Grade':
+            differs = ours.astype(str) != theirs.astype(str)
+        else:
+            ours, theirs = ours.astype('float64'), pd.to_numeric(theirs, errors='coerce').astype('float64')
+            differs = ~np.isclose(ours, theirs, atol=tolerance, rtol=0)
+        if differs.any():
+            parts.append(pd.DataFrame({
+                'Pourashava': computed.index[differs],
+                'Column': column,
+                'Sheet': theirs[differs].astype(str).to_numpy(),
+                'Computed': (ours[differs].round(2) if column != 'Grade' else ours[differs]).astype(str).to_numpy(),
+            }))
+    if not parts:
+        return pd.DataFrame(columns=['Pourashava', 'Column', 'Sheet', 'Computed'])
+    return pd.concat(parts, ignore_index=True)
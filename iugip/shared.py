@@ -0,0 +1,218 @@
+"""One loader process publishing the data for every dashboard process on the host.
+
+Behind a load balancer each Streamlit process would otherwise poll Sheets and
+keep its own copy of every tab. Instead, `python -m iugip.shared publish`
+runs the refresher against the real source and writes each new version as
+uncompressed Arrow IPC files, one per tab, named by content so unchanged tabs
+keep their file. A small CURRENT pointer lists the files of the live version;
+it is written to a temporary file and renamed over the old one, so readers
+see either the old version or the new one, never a mix.
+
+Dashboard processes use IUGIP_DATA_SOURCE=shared[:<dir>]. SharedSource
+memory-maps the files, so the Arrow buffers live once in the page cache
+however many workers read them, and its version() is a stat of the pointer
+rather than a Drive call. Files of the previous version are kept for one
+more publish so a reader that has just read the pointer can still open them.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+import pyarrow as pa
+
+from iugip.schema import coerce
+from iugip.sheets import SPREADSHEET_NAME
+from iugip.snapshot import frame_digest, safe_name, to_arrow
+from iugip.sources import DataSource
+
+logger = logging.getLogger(__name__)
+
+SHARED_DIR = os.environ.get('IUGIP_SHARED_DIR', '.shared')
+POINTER = 'CURRENT'
+
+
+def shared_path(root=SHARED_DIR, spreadsheet=SPREADSHEET_NAME):
+    return os.path.join(root, safe_name(spreadsheet))
+
+
+def read_pointer(path):
+    """The live version's pointer, or None when nothing has been published."""
+    try:
+        with open(os.path.join(path, POINTER)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_table(path, name, frame):
+    target = os.path.join(path, name)
+    if os.path.exists(target):
+        return
+    table = to_arrow(frame)
+    tmp = target + '.tmp'
+    with pa.OSFile(tmp, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, target)
+
+
+def publish(frames, version, modified_time=None, root=SHARED_DIR, spreadsheet=SPREADSHEET_NAME):
+    """Write frames as the live version and return its pointer.
+
+    Only tabs whose content changed get a new file; the pointer is swapped in
+    last, with one rename.
+    """
+    path = shared_path(root, spreadsheet)
+    os.makedirs(path, exist_ok=True)
+    previous = read_pointer(path) or {'tabs': {}, 'sequence': 0}
+
+    tabs = {}
+    for tab, frame in frames.items():
+        name = '{}-{}.arrow'.format(safe_name(tab), frame_digest(frame)[:16])
+        _write_table(path, name, frame)
+        tabs[tab] = {'file': name, 'rows': len(frame)}
+
+    pointer = {
+        'version': version,
+        'modified_time': modified_time,
+        'sequence': previous['sequence'] + 1,
+        'published_at': time.time(),
+        'tabs': tabs,
+    }
+    tmp = os.path.join(path, POINTER + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(pointer, f, indent=2)
+    os.replace(tmp, os.path.join(path, POINTER))
+
+    # Everything but this version and the one before it can go
+    keep = {entry['file'] for entry in tabs.values()} | {entry['file'] for entry in previous['tabs'].values()}
+    for name in os.listdir(path):
+        if name.endswith('.arrow') and name not in keep:
+            os.remove(os.path.join(path, name))
+    return pointer
+
+
+class SharedSnapshot:
+    """Read side of a published spreadsheet: memory-mapped tables behind the CURRENT pointer."""
+
+    def __init__(self, root=SHARED_DIR, spreadsheet=SPREADSHEET_NAME):
+        self.path = shared_path(root, spreadsheet)
+        self._lock = threading.Lock()
+        self._stat = None
+        self._pointer = None
+        self._frames = {}  # file -> frame, so unchanged tabs are converted once
+
+    @property
+    def pointer(self):
+        """The CURRENT pointer, re-read only when the file has been replaced."""
+        stat = os.stat(os.path.join(self.path, POINTER))
+        with self._lock:
+            if (stat.st_ino, stat.st_mtime_ns) != self._stat:
+                pointer = read_pointer(self.path)
+                if pointer is None:
+                    raise FileNotFoundError(os.path.join(self.path, POINTER))
+                self._pointer, self._stat = pointer, (stat.st_ino, stat.st_mtime_ns)
+                live = {entry['file'] for entry in pointer['tabs'].values()}
+                self._frames = {name: frame for name, frame in self._frames.items() if name in live}
+            return self._pointer
+
+    def read(self, tab):
+        entry = self.pointer['tabs'].get(tab)
+        if entry is None:
+            raise KeyError('{} is not in the published version'.format(tab))
+        name = entry['file']
+        with self._lock:
+            frame = self._frames.get(name)
+        if frame is None:
+            # Arrow buffers stay in the shared mapping; split_blocks lets numeric columns use them as they are
+            table = pa.ipc.open_file(pa.memory_map(os.path.join(self.path, name), 'r')).read_all()
+            frame = coerce(tab, table.to_pandas(split_blocks=True))
+            with self._lock:
+                self._frames[name] = frame
+        return frame
+
+
+class SharedSource(DataSource):
+    """The version published by `python -m iugip.shared publish`; never calls Sheets."""
+
+    name = 'shared'
+
+    # The publisher keeps the Parquet snapshot; readers do not need one of their own
+    snapshots = False
+
+    def __init__(self, root=SHARED_DIR):
+        self.root = root
+        self._snapshots = {}
+        self._lock = threading.Lock()
+
+    def _snapshot(self, spreadsheet):
+        with self._lock:
+            if spreadsheet not in self._snapshots:
+                self._snapshots[spreadsheet] = SharedSnapshot(self.root, spreadsheet)
+            return self._snapshots[spreadsheet]
+
+    def version(self, spreadsheet=SPREADSHEET_NAME):
+        pointer = self._snapshot(spreadsheet).pointer
+        # The sequence moves on every publish, even one that only re-reads the same Drive version
+        return '{}#{}'.format(pointer['version'], pointer['sequence']), pointer['modified_time']
+
+    def fetch_tab(self, tab, spreadsheet=SPREADSHEET_NAME):
+        return self._snapshot(spreadsheet).read(tab)
+
+
+def run_publisher(root=SHARED_DIR, interval=None, once=False):
+    """Keep publishing each new DataVersion of the real source until interrupted."""
+    from iugip.refresher import REFRESH_INTERVAL, Refresher
+    from iugip.sources import get_source
+
+    refresher = Refresher(get_source())
+    interval = REFRESH_INTERVAL if interval is None else interval
+    published = None
+    while True:
+        data = refresher.refresh()
+        if data is None or data.stale:
+            # Readers keep the last published version rather than an old local snapshot
+            logger.warning('Nothing new to publish: %s', refresher.status().last_error)
+        elif data is not published:
+            pointer = publish(data.frames, data.version, data.modified_time, root, refresher.spreadsheet)
+            logger.info('Published version %s (#%d)', data.version, pointer['sequence'])
+            published = data
+        if once:
+            return published
+        time.sleep(interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Publish the dashboard data for every dashboard process on this host.')
+    parser.add_argument('--dir', default=SHARED_DIR or '.shared', help='shared directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+    publisher = commands.add_parser('publish', help='poll the source and publish every new version')
+    publisher.add_argument('--interval', type=float, help='seconds between polls (IUGIP_REFRESH_INTERVAL by default)')
+    publisher.add_argument('--once', action='store_true', help='publish once and exit')
+    commands.add_parser('status', help='the version readers are serving')
+    args = parser.parse_args(argv)
+
+    if args.command == 'publish':
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+        try:
+            published = run_publisher(args.dir, args.interval, args.once)
+        except KeyboardInterrupt:
+            return 0
+        return 0 if published is not None else 1
+
+    pointer = read_pointer(shared_path(args.dir))
+    if pointer is None:
+        parser.error('nothing published in ' + args.dir)
+    print('Version {} (#{}) published {}'.format(
+        pointer['version'], pointer['sequence'], time.strftime('%Y-%m-%d %H:%M', time.localtime(pointer['published_at']))))
+    for tab, entry in pointer['tabs'].items():
+        print('  {:<14} {:>6} rows  {}'.format(tab, entry['rows'], entry['file']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
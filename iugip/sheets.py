@@ -0,0 +1,93 @@
+"""Google Sheets access for the dashboard tabs."""
+import threading
+
+import pandas as pd
+from gspread.utils import numericise_all
+
+from iugip.areas import AREAS
+from iugip.profiling import count, stage
+from iugip.schema import coerce
+
+SPREADSHEET_NAME = 'Pourashava_Dashboard_V3'
+
+# Tabs read by the 'Indicators' page, in display order
+INDICATOR_TABS = [area.tab for area in AREAS]
+
+# Every tab the dashboard reads
+DASHBOARD_TABS = ['Overview'] + INDICATOR_TABS
+
+# Spreadsheet ids never change, so the Drive lookup by name is done once
+_spreadsheet_ids = {}
+_spreadsheet_ids_lock = threading.Lock()
+
+
+def spreadsheet_id(clients, spreadsheet=SPREADSHEET_NAME):
+    with _spreadsheet_ids_lock:
+        if spreadsheet not in _spreadsheet_ids:
+            count('drive.open')
+            with stage('drive.open'):
+                _spreadsheet_ids[spreadsheet] = clients.gspread.open(spreadsheet).id
+        return _spreadsheet_ids[spreadsheet]
+
+
+def drive_version(clients, spreadsheet=SPREADSHEET_NAME):
+    """Cheap Drive metadata read: (version, modifiedTime) of the spreadsheet."""
+    file_id = spreadsheet_id(clients, spreadsheet)
+    count('drive.files.get')
+    with stage('drive.version'):
+        meta = clients.drive().files().get(fileId=file_id, fields='version,modifiedTime').execute()
+    return meta.get('version'), meta.get('modifiedTime')
+
+
+def values_to_frame(values, empty2zero=True):
+    """Build the same frame get_all_records(empty2zero=True) would from raw cell values."""
+    if not values:
+        return pd.DataFrame()
+    keys, rows = values[0], values[1:]
+    width = len(keys)
+
+    # The values API trims trailing empty cells, so pad every row back to the header width
+    rows = [row + [''] * (width - len(row)) for row in rows]
+    records = [dict(zip(keys, numericise_all(row, empty2zero))) for row in rows]
+    return pd.DataFrame(records, columns=list(dict.fromkeys(keys))).dropna()
+
+
+def _a1_tab(tab):
+    # A whole-tab A1 range; quotes are needed for names like 'FIN MGT' and 'O&M'
+    return "'{}'".format(tab.replace("'", "''"))
+
+
+def batch_fetch_tabs(clients, tabs, spreadsheet=SPREADSHEET_NAME):
+    """Read several tabs of one spreadsheet with a single values.batchGet request."""
+    file_id = spreadsheet_id(clients, spreadsheet)
+    count('sheets.values.batchGet')
+    with stage('sheets.batch_get', tabs=len(tabs)):
+        response = clients.sheets().spreadsheets().values().batchGet(
+            spreadsheetId=file_id,
+            ranges=[_a1_tab(tab) for tab in tabs],
+            majorDimension='ROWS',
+            valueRenderOption='FORMATTED_VALUE',
+        ).execute()
+
+    # valueRanges come back in the same order as the requested ranges
+    with stage('ingest.frames', tabs=len(tabs)):
+        return {
+            tab: coerce(tab, values_to_frame(value_range.get('values', [])))
+            for tab, value_range in zip(tabs, response.get('valueRanges', []))
+        }
+
+
+def fetch_tab(clients, tab, spreadsheet=SPREADSHEET_NAME):
+    """Read one worksheet straight from Google Sheets."""
+    file_id = spreadsheet_id(clients, spreadsheet)
+    # open_by_key and worksheet() each fetch the spreadsheet metadata
+    count('sheets.metadata', 2)
+    count('sheets.values.get')
+    with stage('sheets.get_all_records', tab=tab):
+        worksheet = clients.gspread.open_by_key(file_id).worksheet(tab)
+        data = worksheet.get_all_records(empty2zero=True)
+
+    # Convert the worksheet data to a Pandas dataframe
+    with stage('ingest.frames', tabs=1):
+        return coerce(tab, pd.DataFrame(data).dropna())
+
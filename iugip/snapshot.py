@@ -0,0 +1,164 @@
+"""Local Parquet snapshots of the dashboard spreadsheet.
+
+Each tab is stored as one Parquet file next to a manifest.json recording the
+Drive version of the spreadsheet it was read from. A sync costs a single
+Drive files.get call while that version is unchanged; once it moves, all
+known tabs are re-read with one values.batchGet and only tabs whose content
+actually changed are rewritten on disk.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from iugip.schema import coerce
+from iugip.sheets import DASHBOARD_TABS, SPREADSHEET_NAME
+
+SNAPSHOT_DIR = os.environ.get('IUGIP_SNAPSHOT_DIR', '.snapshots')
+CHECK_INTERVAL = float(os.environ.get('IUGIP_SNAPSHOT_CHECK_INTERVAL', 60))
+
+
+def frame_digest(frame):
+    """Content hash of a frame, including its column names."""
+    digest = hashlib.sha1(repr(list(frame.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def safe_name(name):
+    """name with every run of characters unsafe in a file name replaced by '_'."""
+    # Tab names such as 'O&M' or 'FIN MGT' are not safe file names as they stand
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', str(name))
+
+
+def to_arrow(frame):
+    # Sheets columns can mix numbers and text (empty2zero turns blanks into 0),
+    # which Arrow cannot type; store those columns as text
+    frame = frame.copy()
+    for column in frame.columns[frame.dtypes == object]:
+        if frame[column].map(type).nunique() > 1:
+            frame[column] = frame[column].astype(str)
+    return pa.Table.from_pandas(frame, preserve_index=False)
+
+
+def _file_name(tab):
+    # The hash keeps tabs whose names only differ in unsafe characters apart
+    return safe_name(tab) + '-' + hashlib.sha1(tab.encode()).hexdigest()[:8] + '.parquet'
+
+
+class SnapshotStore:
+    """Parquet copy of one spreadsheet, refreshed when its Drive version moves."""
+
+    def __init__(self, root=SNAPSHOT_DIR, spreadsheet=SPREADSHEET_NAME, tabs=(), check_interval=CHECK_INTERVAL):
+        self.spreadsheet = spreadsheet
+        self.tabs = list(tabs)
+        self.path = os.path.join(root, safe_name(spreadsheet))
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._manifest = None
+
+    @property
+    def manifest(self):
+        with self._lock:
+            if self._manifest is None:
+                try:
+                    with open(os.path.join(self.path, 'manifest.json')) as f:
+                        self._manifest = json.load(f)
+                except (OSError, ValueError):
+                    self._manifest = {'version': None, 'modified_time': None, 'checked_at': 0, 'tabs': {}}
+            return self._manifest
+
+    def _save_manifest(self):
+        os.makedirs(self.path, exist_ok=True)
+        tmp = os.path.join(self.path, 'manifest.json.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self._manifest, f, indent=2)
+        os.replace(tmp, os.path.join(self.path, 'manifest.json'))
+
+    def has(self, tab):
+        return tab in self.manifest['tabs']
+
+    def read(self, tab):
+        entry = self.manifest['tabs'][tab]
+        # Files written before a schema change are brought up to the declared types
+        return coerce(tab, pq.read_table(os.path.join(self.path, entry['file'])).to_pandas())
+
+    def write(self, tab, frame, digest=None):
+        os.makedirs(self.path, exist_ok=True)
+        name = _file_name(tab)
+        tmp = os.path.join(self.path, name + '.tmp')
+        pq.write_table(to_arrow(frame), tmp)
+        # Readers never see a half-written file
+        os.replace(tmp, os.path.join(self.path, name))
+        with self._lock:
+            self.manifest['tabs'][tab] = {
+                'file': name,
+                'digest': digest or frame_digest(frame),
+                'rows': len(frame),
+                'written_at': time.time(),
+            }
+
+    def sync(self, source, tabs=(), force=False, max_age=None):
+        """Bring the snapshot up to date and return the tabs whose content changed.
+
+        The Drive version is only checked when the last check is older than
+        max_age seconds (check_interval by default); force re-reads every tab.
+        """
+        with self._lock:
+            manifest = self.manifest
+            now = time.time()
+            max_age = self.check_interval if max_age is None else max_age
+            tabs = list(dict.fromkeys(self.tabs + list(tabs)))
+            missing = [tab for tab in tabs if tab not in manifest['tabs']]
+            if not force and not missing and now - manifest['checked_at'] < max_age:
+                return []
+
+            version, modified_time = source.version(self.spreadsheet)
+            if force or version != manifest['version']:
+                # Drive only versions the whole file, so every known tab is re-read in one request
+                stale = sorted(set(manifest['tabs']) | set(tabs))
+            else:
+                stale = missing
+
+            frames = source.fetch_tabs(stale, self.spreadsheet) if stale else {}
+            return self.update(version, modified_time, frames, checked_at=now)
+
+    def update(self, version, modified_time, frames, checked_at=None):
+        """Store frames read at the given Drive version; returns the tabs whose content changed."""
+        with self._lock:
+            changed = []
+            for tab, frame in frames.items():
+                digest = frame_digest(frame)
+                if self.manifest['tabs'].get(tab, {}).get('digest') != digest:
+                    self.write(tab, frame, digest)
+                    changed.append(tab)
+            self.manifest.update(version=version, modified_time=modified_time, checked_at=checked_at or time.time())
+            self._save_manifest()
+            return changed
+
+    def load(self, source, tabs):
+        """Sync, then serve the requested tabs from disk; also returns the changed tabs."""
+        with self._lock:
+            changed = self.sync(source, tabs)
+            return {tab: self.read(tab) for tab in tabs}, changed
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def snapshot_store(spreadsheet=SPREADSHEET_NAME):
+    """Process-wide store for a spreadsheet, or None when IUGIP_SNAPSHOT_DIR is empty."""
+    if not SNAPSHOT_DIR:
+        return None
+    with _stores_lock:
+        if spreadsheet not in _stores:
+            tabs = DASHBOARD_TABS if spreadsheet == SPREADSHEET_NAME else ()
+            _stores[spreadsheet] = SnapshotStore(SNAPSHOT_DIR, spreadsheet, tabs)
+        return _stores[spreadsheet]
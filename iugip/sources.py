@@ -0,0 +1,89 @@
+"""Pluggable backends for the dashboard spreadsheet.
+
+The loader, snapshot store and refresher only need three operations from a
+backend, so anything offering them can stand in for Google Sheets:
+
+    version(spreadsheet)            -> (version, modified_time)
+    fetch_tabs(tabs, spreadsheet)   -> {tab: DataFrame}, ideally one request
+    fetch_tab(tab, spreadsheet)     -> DataFrame
+
+IUGIP_DATA_SOURCE picks the backend: 'sheets' (the default),
+'fixture:<pourashavas>[:<latency seconds>[:<failure rate>]]' for synthetic
+offline data, or 'shared[:<directory>]' for the version another process
+publishes (see iugip.shared). get_source() puts it behind a circuit breaker
+and single-flight (see iugip.resilience).
+"""
+import os
+import threading
+
+from iugip.sheets import SPREADSHEET_NAME
+
+
+class DataSource:
+    """Base class for spreadsheet backends."""
+
+    name = 'source'
+
+    # Whether reads should go through the local Parquet snapshot store
+    snapshots = True
+
+    def version(self, spreadsheet=SPREADSHEET_NAME):
+        raise NotImplementedError
+
+    def fetch_tabs(self, tabs, spreadsheet=SPREADSHEET_NAME):
+        return {tab: self.fetch_tab(tab, spreadsheet) for tab in tabs}
+
+    def fetch_tab(self, tab, spreadsheet=SPREADSHEET_NAME):
+        raise NotImplementedError
+
+
+class SheetsSource(DataSource):
+    """The live spreadsheet, through the process-wide Google clients."""
+
+    name = 'sheets'
+
+    def __init__(self, clients):
+        self.clients = clients
+
+    def version(self, spreadsheet=SPREADSHEET_NAME):
+        from iugip.sheets import drive_version
+        return drive_version(self.clients, spreadsheet)
+
+    def fetch_tabs(self, tabs, spreadsheet=SPREADSHEET_NAME):
+        from iugip.sheets import batch_fetch_tabs
+        return batch_fetch_tabs(self.clients, tabs, spreadsheet)
+
+    def fetch_tab(self, tab, spreadsheet=SPREADSHEET_NAME):
+        from iugip.sheets import fetch_tab
+        return fetch_tab(self.clients, tab, spreadsheet)
+
+
+def source_from_spec(spec):
+    """Build a source from an IUGIP_DATA_SOURCE value."""
+    kind, _, options = spec.partition(':')
+    if kind == 'sheets':
+        from iugip.clients import get_clients
+        return SheetsSource(get_clients())
+    if kind == 'fixture':
+        from iugip.fixtures import FixtureSource
+        size, latency, failure_rate = (options.split(':') + ['', ''])[:3]
+        return FixtureSource(int(size or 50), latency=float(latency or 0), failure_rate=float(failure_rate or 0))
+    if kind == 'shared':
+        from iugip.shared import SHARED_DIR, SharedSource
+        return SharedSource(options or SHARED_DIR or '.shared')
+    raise ValueError('Unknown IUGIP_DATA_SOURCE {!r}'.format(spec))
+
+
+_source = None
+_source_lock = threading.Lock()
+
+
+def get_source():
+    """The process-wide data source, built on first use."""
+    from iugip.resilience import ResilientSource
+
+    global _source
+    with _source_lock:
+        if _source is None:
+            _source = ResilientSource(source_from_spec(os.environ.get('IUGIP_DATA_SOURCE', 'sheets')))
+        return _source
@@ -0,0 +1,27 @@
+"""Table builders shared by the dashboard pages and offline tools."""
+import pandas as pd
+
+from iugip.areas import AREAS
+
+
+def indicator_table(wide, pourashavas, skip_tabs=()):
+    """One row per indicator, grouped by area, with one status column per Pourashava.
+
+    Areas whose tab is in skip_tabs (e.g. tabs that failed to load) are left out.
+    """
+    areas = [area for area in AREAS if area.tab not in skip_tabs]
+    indicators = [indicator for area in areas for indicator in area.indicators]
+
+    values = wide.loc[list(pourashavas)].reindex(columns=indicators).T
+    # Statuses are categories per column; after the transpose they are plain text
+    values = values.astype(object).where(values.notna(), '').astype(str)
+    values.columns = [str(name) for name in values.columns]
+
+    table = pd.concat([
+        pd.DataFrame({
+            'Area': [area.label for area in areas for _ in area.indicators],
+            'Indicator': indicators,
+        }),
+        values.reset_index(drop=True),
+    ], axis=1)
+    return table
@@ -0,0 +1,35 @@
+"""Dashboard pages, imported only when selected.
+
+Each page module pulls in its own charting backend (folium, plotly or
+altair), so a session that never opens a page never pays for its imports.
+"""
+import importlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Sidebar label -> module with a render(data) function, in sidebar order
+PAGES = {
+    'About': 'iugip.views.about',
+    'Overview': 'iugip.views.overview',
+    'Area wise Performance': 'iugip.views.area',
+    'Pourashava Pefromance': 'iugip.views.performance',
+    'Indicators': 'iugip.views.indicators',
+    'Trends': 'iugip.views.trends',
+    'What-if': 'iugip.views.whatif',
+}
+
+# First-import time of each page module in this process, in seconds
+import_times = {}
+
+
+def load_page(option):
+    name = PAGES[option]
+    if name not in import_times:
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        import_times[name] = time.perf_counter() - started
+        logger.info('Imported %s in %.0f ms', name, import_times[name] * 1000)
+        return module
+    return importlib.import_module(name)
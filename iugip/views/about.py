@@ -0,0 +1,8 @@
+"""The 'About' page."""
+import streamlit as st
+
+
+def render(data):
+    #st.header('XXXX')
+    st.write("The Government of the People's Republic of Bangladesh will receive a loan towards the cost of the Improving Urban Governance and Infrastructure Program (IUGIP) from Asian Development Bank (ADB) and Agence Francaise De Development (AFD). It is expected that the fund or loan will be received from ADB and AFD for the 50 target Pourashavas (PSs), for enhancing the scope of the Pourashavas. The project is going to launch implementation activities in 2023 and planned to be implemented over a period of 6 (six) years with ending in 2029.")
+    st.write('The Dashbaord - Text to be added')
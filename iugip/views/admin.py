@@ -0,0 +1,59 @@
+"""Hidden profiling panel in the sidebar, shown with ?admin=<token> in the URL.
+
+The token is IUGIP_ADMIN_TOKEN; when it is not set the panel stays off.
+"""
+import os
+import sys
+
+import pandas as pd
+import streamlit as st
+
+from iugip.profiling import PROFILER
+
+ADMIN_TOKEN = os.environ.get('IUGIP_ADMIN_TOKEN', '')
+
+
+def is_admin(query_params):
+    """True when the URL carries the admin token."""
+    return bool(ADMIN_TOKEN) and ADMIN_TOKEN in query_params.get('admin', [])
+
+
+def _cache_stats():
+    from iugip.loader import TAB_CACHE
+
+    stats = {'Tabs': TAB_CACHE.stats()}
+    # Only report the map cache if the Overview page has pulled in folium already
+    maps = sys.modules.get('iugip.maps')
+    if maps is not None:
+        stats['Maps'] = maps.MAP_CACHE.stats()
+    return pd.DataFrame.from_dict(stats, orient='index')
+
+
+def render_panel(refresher):
+    from iugip.views import import_times
+
+    with st.sidebar.expander('Profiling', expanded=True):
+        summary = PROFILER.summary()
+        st.caption(f"Stage timings in ms, last {PROFILER.window} runs per stage")
+        if summary:
+            st.dataframe(pd.DataFrame.from_dict(summary, orient='index').round(1))
+
+        st.caption('Sheets and Drive calls since start')
+        calls = PROFILER.calls()
+        if calls:
+            st.dataframe(pd.Series(calls, name='calls').sort_index().to_frame())
+
+        st.caption('Caches')
+        st.dataframe(_cache_stats())
+
+        if import_times:
+            st.caption('Page import times in ms')
+            st.dataframe(pd.Series({name: seconds * 1000 for name, seconds in import_times.items()}, name='ms').round(1).to_frame())
+
+        status = refresher.status()
+        st.caption(f"Data version {status.version}, {status.failures} failed refresh(es) since start")
+        breaker = getattr(refresher.source, 'breaker', None)
+        if breaker is not None:
+            st.caption(f"Circuit {breaker.state}" + (f", last error {breaker.last_error}" if breaker.last_error else ''))
+        if st.button('Reset timings'):
+            PROFILER.reset()
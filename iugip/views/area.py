@@ -0,0 +1,17 @@
+"""The 'Area wise Performance' page: scores of every Pourashava in each governance area."""
+import streamlit as st
+
+from iugip.figures import area_performance_chart
+from iugip.profiling import stage
+
+
+def render(data):
+    df = data.overview
+
+    # One long-format transform and one chart for all nine areas
+    with stage('area.chart'):
+        chart = area_performance_chart(df)
+
+    # Display the chart
+    with stage('area.chart.serialize'):
+        st.altair_chart(chart, use_container_width=True)
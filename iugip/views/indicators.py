@@ -0,0 +1,117 @@
+"""The 'Indicators' page: indicator status tables for one or more Pourashavas."""
+import time
+from concurrent.futures import TimeoutError, as_completed
+
+import streamlit as st
+
+from iugip.areas import AREAS
+from iugip.ingest import build_wide, has_issues
+from iugip.loader import TAB_TIMEOUT
+from iugip.profiling import PROFILER, stage
+from iugip.tables import indicator_table
+
+ROW_HEIGHT = 35
+
+# Shown in a section until its tab has loaded
+SKELETON = "<div style='color: gray; font-size: 14px; padding: 8px 0;'>&#9203; Loading {} &hellip;</div>"
+
+
+def _height(rows, limit=None):
+    # Enough room for every row plus the header, so short tables do not scroll
+    height = (rows + 1) * ROW_HEIGHT + 3
+    return min(height, limit) if limit else height
+
+
+def _select(names):
+    # Create a sidebar with options to filter by pourashava, and to compare with others
+    selected_pourashava = st.sidebar.selectbox('Select a pourashava:', names)
+    compare = st.sidebar.multiselect('Compare with:', [name for name in names if name != selected_pourashava])
+    return [selected_pourashava] + compare
+
+
+def render_progressive(overview, loading):
+    """Draw every section at once and fill each one in as its tab arrives.
+
+    Used while the first data load is still running: overview is the loaded
+    Overview frame and loading maps each tab to a Future of its TabResult.
+    """
+    started = time.perf_counter()
+    pourashavas = _select(sorted(overview['Pourashava'].astype(str).unique()))
+    st.markdown(f"<h2 style='font-size: 20px;'>Indicators for {', '.join(pourashavas)}</h2>", unsafe_allow_html=True)
+
+    # The whole layout first, with a skeleton marker in each section
+    sections = {}
+    for area in AREAS:
+        st.markdown(f"<h2 style='font-size: 20px;'> {area.label} </h2>", unsafe_allow_html=True)
+        sections[area.tab] = st.empty()
+        sections[area.tab].markdown(SKELETON.format(area.label), unsafe_allow_html=True)
+
+    areas = {loading[area.tab]: area for area in AREAS if area.tab in loading}
+    first = True
+    try:
+        for future in as_completed(areas, timeout=TAB_TIMEOUT * 2):
+            area, result = areas[future], future.result()
+            section = sections.pop(area.tab)
+            if result.frame is None:
+                section.warning(f'{area.tab} could not be loaded ({result.status})')
+                continue
+            with stage('indicators.section', area=area.column):
+                wide, _ = build_wide(overview, {area.tab: result.frame}, areas=[area])
+                area_table = indicator_table(wide, pourashavas).drop(columns='Area')
+                section.dataframe(area_table, height=_height(len(area_table)))
+            if first:
+                PROFILER.record('indicators.first_section', (time.perf_counter() - started) * 1000)
+                first = False
+    except TimeoutError:
+        pass
+    for tab, section in sections.items():
+        section.warning(f'{tab} is taking too long to load; it will be shown on the next run.')
+
+
+def render(data):
+    # All nine indicator tabs come from the latest background refresh
+    if data.errors:
+        st.warning('Some indicator tabs could not be refreshed: ' + ', '.join(f'{tab} ({status})' for tab, status in data.errors.items()))
+
+    pourashavas = _select(data.pourashavas)
+    layout = st.sidebar.radio('Indicator tables:', ['One table', 'One table per area'])
+
+    # Every indicator of every area in one frame, sent to the browser as Arrow; tabs that never loaded are left out
+    with stage('indicators.table', pourashavas=len(pourashavas)):
+        table = indicator_table(data.wide, pourashavas, skip_tabs=[area.tab for area in AREAS if area.tab not in data.frames])
+
+    st.markdown(f"<h2 style='font-size: 20px;'>Indicators for {', '.join(pourashavas)}</h2>", unsafe_allow_html=True)
+
+    if layout == 'One table':
+        with stage('indicators.table.serialize', rows=len(table)):
+            st.dataframe(table, height=_height(len(table), limit=900))
+    else:
+        for area in AREAS:
+            st.markdown(f"<h2 style='font-size: 20px;'> {area.label} </h2>", unsafe_allow_html=True)
+            area_table = table[table['Area'] == area.label].drop(columns='Area').reset_index(drop=True)
+            with stage('indicators.table.serialize', rows=len(area_table), area=area.column):
+                st.dataframe(area_table, height=_height(len(area_table)))
+
+    # Pourashava names that do not line up across tabs, values failing the schema checks,
+    # and sheet scores that do not follow from the indicator statuses
+    report = data.name_report
+    mismatches = data.score_mismatches if data.score_mismatches is not None else []
+    unknown = data.scores.unknown if data.scores is not None else {}
+    if has_issues(report) or data.schema_issues or len(mismatches) or unknown:
+        with st.expander('Data consistency'):
+            for tab, issues in data.schema_issues.items():
+                for issue in issues:
+                    st.write(f"**{tab}**: {issue}")
+            for tab, names in report.missing.items():
+                st.write(f"**{tab}**: " + ('tab not loaded' if names is None else 'no rows for ' + ', '.join(names)))
+            for tab, names in report.unmatched.items():
+                st.write(f"**{tab}**: unknown Pourashava " + ', '.join(names))
+            for tab, spellings in report.respelled.items():
+                st.write(f"**{tab}**: " + ', '.join(f"'{name}' read as '{match}'" for name, match in spellings.items()))
+            for tab, names in report.duplicates.items():
+                st.write(f"**{tab}**: listed more than once: " + ', '.join(names))
+            for indicator, values in unknown.items():
+                st.write(f"**{indicator}**: status not in the scoring rubric: " + ', '.join(map(str, values)))
+            if len(mismatches):
+                st.write(f"**Overview**: {len(mismatches)} score(s) differ from the ones computed from the indicators")
+                st.dataframe(mismatches, height=_height(len(mismatches), limit=400))
@@ -0,0 +1,49 @@
+"""The 'Overview' page: map of the Pourashavas, grade distribution and Top 10."""
+import streamlit as st
+import streamlit.components.v1 as components
+
+from iugip.figures import grade_bar_figure, grade_pie_figure
+from iugip.maps import MAP_HEIGHT, MAP_WIDTH, render_map_html
+from iugip.profiling import stage
+
+
+def render(data):
+    df = data.overview
+
+    st.write('Location of the Participating Pourashava')
+    
+    ###### Create a map centered on Bangladesh, with one marker per pourashava colored by grade
+    # (the rendered HTML is cached until the mapped columns change)
+    with stage('overview.map'):
+        map_html = render_map_html(df)
+
+    # Display the map the same way folium_static does
+    with stage('overview.map.serialize'):
+        components.html(map_html, height=MAP_HEIGHT + 10, width=MAP_WIDTH)
+    ### ------------------
+
+    ##### Grade counts, ranks and Top 10 are precomputed once per data version
+    aggregates = data.aggregates
+
+    with stage('overview.figures'):
+        # Create the pie chart of the number of Pourashavas in each Grade category
+        fig_pie = grade_pie_figure(aggregates.grade_counts)
+            
+        # Create a horizontal bar chart of the Grade counts
+        fig_bar = grade_bar_figure(aggregates.grade_bar_counts)
+            
+  
+    col1, col2 = st.columns(2)
+    with stage('overview.figures.serialize'):
+        with col1:
+            st.plotly_chart(fig_pie, use_container_width=True)
+        with col2:
+            st.plotly_chart(fig_bar, use_container_width=True)
+
+    st.markdown("<h3 style='text-align: center;font-size: 15px;'>A+ (Outstanding), A (Very Good), B (Good), C (Average), D (Unsatisfactory)</h3>", unsafe_allow_html=True)
+     
+    # Top 10 pourashvas
+
+    st.markdown("<h2 style='font-size: 20px;'>Top 10 Pourashavas</h2>", unsafe_allow_html=True)
+    with stage('overview.top_table.serialize'):
+        st.table(aggregates.top_table('Total Score'))
@@ -0,0 +1,63 @@
+"""The 'Pourashava Pefromance' page: achievement against max score per area, for one or several Pourashavas."""
+import streamlit as st
+
+from iugip.figures import comparison_figure, performance_figure
+from iugip.profiling import stage
+
+MODES = ['One Pourashava', 'Compare Pourashavas', 'Peers']
+PEER_KINDS = {'Similar total score': 'peers_by_total', 'Similar area scores': 'peers_by_profile'}
+
+
+def _one(data, percent):
+    # Create a sidebar with options to filter by pourashava
+    selected_pourashava = st.sidebar.selectbox('Select a pourashava:', data.pourashavas)
+
+    # Look up the pourashava's row in the Pourashava-indexed table
+    row = data.wide.loc[selected_pourashava]
+
+    # One grouped bar chart for all nine areas
+    with stage('performance.figure'):
+        fig = performance_figure(row, 'Performance Comparison for ' + selected_pourashava, percent=percent)
+    with stage('performance.figure.serialize'):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def _compare(data, names, percent):
+    aggregates = data.aggregates
+    with stage('performance.compare', pourashavas=len(names)):
+        fig = comparison_figure(data.wide.loc[names], percent=percent)
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Ranks and percentiles are read from the matrix precomputed for this data version
+    measure = st.radio('Table:', ['Score', 'Rank', 'Percentile'])
+    st.dataframe(aggregates.comparison(names, measure))
+    if measure == 'Rank':
+        st.caption('Rank 1 is the highest score; equal scores share a rank.')
+    elif measure == 'Percentile':
+        st.caption('Share of Pourashavas scoring the same or lower.')
+
+
+def render(data):
+    mode = st.sidebar.radio('Show:', MODES)
+    percent = st.sidebar.checkbox('Show as % of max score')
+
+    if mode == 'One Pourashava':
+        _one(data, percent)
+        return
+
+    if mode == 'Compare Pourashavas':
+        names = st.sidebar.multiselect('Pourashavas:', data.pourashavas, default=data.pourashavas[:2])
+    else:
+        selected_pourashava = st.sidebar.selectbox('Peers of:', data.pourashavas)
+        kind = st.sidebar.radio('Peers with:', list(PEER_KINDS))
+        k = st.sidebar.slider('Number of peers:', 1, 25, 5)
+        with stage('performance.peers'):
+            names = [selected_pourashava] + getattr(data.aggregates, PEER_KINDS[kind])(selected_pourashava, k)
+
+    # A selection carried over from an older data version may name towns that are gone
+    names = [name for name in names if name in data.wide.index]
+    if not names:
+        st.write('Pick the Pourashavas to compare in the sidebar.')
+        return
+    st.markdown(f"<h2 style='font-size: 20px;'>Performance Comparison for {', '.join(names)}</h2>", unsafe_allow_html=True)
+    _compare(data, names, percent)
@@ -0,0 +1,44 @@
+"""The 'Trends' page: scores across assessment cycles and the most improved Pourashavas."""
+import streamlit as st
+
+from iugip.aggregates import SCORE_COLUMNS
+from iugip.areas import AREAS_BY_COLUMN, area_title
+from iugip.figures import trend_chart
+from iugip.history import history_store
+from iugip.profiling import stage
+
+
+def _measure_title(column):
+    return column if column == 'Total Score' else area_title(AREAS_BY_COLUMN[column])
+
+
+def render(data):
+    store = history_store()
+    cycles = store.cycles() if store is not None else []
+    if not cycles:
+        st.info('No assessment cycles recorded yet. Record one with: python -m iugip.history record <cycle>')
+        return
+
+    # Create a sidebar with options to pick the score and the comparison
+    measure = st.sidebar.selectbox('Score:', SCORE_COLUMNS, format_func=_measure_title)
+    since = st.sidebar.radio('Improvement since:', ['previous', 'first'], format_func=lambda value: f'{value} cycle')
+
+    # Most improved in the latest cycle, read from the deltas stored with it
+    st.markdown(f"<h2 style='font-size: 20px;'>Most improved in {cycles[-1]}: {_measure_title(measure)}</h2>", unsafe_allow_html=True)
+    if len(cycles) < 2:
+        st.write(f"Only cycle {cycles[0]} is recorded so far.")
+    else:
+        with stage('trends.improved'):
+            improved = store.most_improved(measure, since)
+        st.table(improved)
+
+    # Default to the most improved towns, so the chart is not 300 lines
+    with stage('trends.history'):
+        trend = store.trend(measure)
+    names = sorted(trend['Pourashava'].unique())
+    default = [name for name in (improved['Pourashava'] if len(cycles) > 1 else names[:5]) if name in names]
+    selected = st.sidebar.multiselect('Pourashavas:', names, default=default)
+    if selected:
+        chart = trend_chart(trend[trend['Pourashava'].isin(selected)], _measure_title(measure))
+        with stage('trends.chart.serialize'):
+            st.altair_chart(chart, use_container_width=True)
@@ -0,0 +1,72 @@
+"""The 'What-if' page: change indicator outcomes or area scores and see the grades move."""
+import streamlit as st
+
+from iugip.areas import AREAS
+from iugip.figures import grade_bar_figure, grade_pie_figure
+from iugip.profiling import stage
+from iugip.whatif import Scenario, baseline
+
+STATUSES = ['Yes', 'Partially', 'No', 'Not Due']
+
+INDICATOR_LABELS = {indicator: f'{area.label}: {indicator}' for area in AREAS for indicator in area.indicators}
+
+
+def _scenario(data):
+    # One scenario per session, started again whenever a new data version lands
+    scenario = st.session_state.get('whatif')
+    if scenario is None or scenario.base is not baseline(data):
+        scenario = st.session_state['whatif'] = Scenario(baseline(data))
+    return scenario
+
+
+def render(data):
+    scenario = _scenario(data)
+
+    # Create a sidebar with the change to apply and the Pourashavas to apply it to
+    pourashavas = st.sidebar.multiselect('Pourashavas:', data.pourashavas)
+    # Indicator points come from the scoring rubric, so without one only area scores can change
+    if scenario.base.rubric is not None:
+        change = st.sidebar.radio('Change:', ['Indicator status', 'Area score'])
+    else:
+        change = 'Area score'
+        st.sidebar.caption(
+            'Indicator changes need the scoring rubric: set IUGIP_RUBRIC to a JSON file '
+            'laid out like rubric.example.json. Grades follow the score ranges the sheet uses.')
+    if change == 'Indicator status':
+        indicators = st.sidebar.multiselect('Indicators:', list(INDICATOR_LABELS), format_func=INDICATOR_LABELS.get)
+        status = st.sidebar.selectbox('New status:', STATUSES)
+    else:
+        area = st.sidebar.selectbox('Area:', AREAS, format_func=lambda area: area.label)
+        score = st.sidebar.slider('New score:', 0.0, float(area.max_score), float(area.max_score), 0.5)
+
+    if st.sidebar.button('Apply') and pourashavas:
+        with stage('whatif.apply', pourashavas=len(pourashavas)):
+            if change == 'Indicator status':
+                scenario.set_status(pourashavas, indicators, status)
+            else:
+                scenario.set_area(pourashavas, area.column, score)
+    if st.sidebar.button('Reset'):
+        scenario.clear()
+
+    # Grade distribution, Top 10 and the edited Pourashavas, from the incremental aggregates
+    with stage('whatif.aggregates'):
+        changes = scenario.changes()
+        top = scenario.top_table()
+        fig_pie = grade_pie_figure(scenario.grade_pie_counts())
+        fig_bar = grade_bar_figure(scenario.grade_bar_counts())
+
+    if not len(changes):
+        st.write('Pick Pourashavas and a change in the sidebar, then press Apply.')
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(fig_pie, use_container_width=True)
+    with col2:
+        st.plotly_chart(fig_bar, use_container_width=True)
+
+    if len(changes):
+        st.markdown("<h2 style='font-size: 20px;'>Changed Pourashavas</h2>", unsafe_allow_html=True)
+        st.dataframe(changes)
+
+    st.markdown("<h2 style='font-size: 20px;'>Top 10 Pourashavas</h2>", unsafe_allow_html=True)
+    st.table(top)
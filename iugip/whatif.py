@@ -0,0 +1,238 @@
+"""What-if scenarios: change indicator outcomes or area scores and re-grade incrementally.
+
+Baseline holds everything the 'Overview' aggregates are derived from, built
+once per data version: area scores, totals, grades, the Total Score order,
+and the grade and score counts. A Scenario records edits on top of it. Each
+edit re-scores only the Pourashava it touches and moves that one row in the
+grade counts and the sorted distinct scores, so ranks are bisections and
+Top-N only re-sorts the edited rows against the baseline leaders.
+
+Indicator edits need the official scoring rubric (IUGIP_RUBRIC). Without it
+only area scores can be changed, and new totals are graded with the lowest
+Total Score the sheet itself gives each grade.
+"""
+import bisect
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from iugip.aggregates import TOP_N
+from iugip.areas import AREAS
+from iugip.cache import TTLCache
+from iugip.schema import GRADES
+from iugip.scoring import BLANK, grade, indicator_points, rubric
+
+# Baselines by data version; only the newest one or two are ever in use
+BASELINES = TTLCache(ttl=None, max_entries=2, sizeof=lambda value: 0)
+
+AREA_COLUMNS = [area.column for area in AREAS]
+INDICATORS = [indicator for area in AREAS for indicator in area.indicators]
+INDICATOR_AREA = {indicator: position for position, area in enumerate(AREAS) for indicator in area.indicators}
+
+
+def status_share(status, status_points):
+    """Share of full points a status earns; blanks and unknown statuses earn nothing."""
+    key = str(status).strip().casefold()
+    return 0.0 if key in BLANK else status_points.get(key, 0.0)
+
+
+def sheet_bands(totals, grades):
+    """Grade bands as the sheet applies them: the lowest Total Score given each grade, best first."""
+    bands = []
+    for name in GRADES:
+        scored = totals[(grades == name) & ~np.isnan(totals)]
+        if len(scored):
+            bands.append((float(scored.min()), name))
+    bands.sort(reverse=True)
+    if bands:
+        # Nothing can fall below the lowest grade
+        bands[-1] = (-np.inf, bands[-1][1])
+    return bands
+
+
+class Baseline:
+    """Scores, grades, order and counts of one data version; never modified."""
+
+    def __init__(self, data, rubric=None):
+        wide = data.wide
+        self.wide = wide
+        self.names = list(wide.index)
+        self.positions = {name: position for position, name in enumerate(self.names)}
+        self.areas = wide.reindex(columns=AREA_COLUMNS).astype('float64').fillna(0).to_numpy()
+        self.totals = wide['Total Score'].astype('float64').to_numpy()
+        self.grades = wide['Grade'].astype(str).to_numpy()
+
+        # Best first; the sort is stable so ties keep the sheet order, as in Aggregates
+        self.order = np.argsort(-np.nan_to_num(self.totals, nan=-np.inf), kind='mergesort')
+        self.ranks = pd.Series(self.totals).rank(method='dense', ascending=False).to_numpy()
+        self.grade_counts = Counter(self.grades)
+        self.score_counts = Counter(self.totals[~np.isnan(self.totals)].tolist())
+
+        self.rubric = rubric
+        if rubric is not None:
+            self.points = dict(zip(INDICATORS, indicator_points(AREAS, rubric.points)))
+            self.bands = rubric.bands
+        else:
+            self.points = None
+            self.bands = sheet_bands(self.totals, self.grades)
+
+    def status(self, name, indicator):
+        return self.wide.at[name, indicator] if indicator in self.wide.columns else None
+
+
+def baseline(data):
+    """The shared Baseline of a data version, with the configured rubric."""
+    return BASELINES.get_or_load((id(data), data.built_at), lambda: Baseline(data, rubric()))
+
+
+class Scenario:
+    """Edits on top of a Baseline, with aggregates kept current one row at a time."""
+
+    def __init__(self, base):
+        self.base = base
+        self.statuses = {}  # (name, indicator) -> status
+        self.overrides = {}  # (name, area column) -> score
+        self.rows = {}  # position -> (areas, total, grade) for every edited row
+        self.grade_counts = Counter(base.grade_counts)
+        self.score_counts = Counter(base.score_counts)
+        self._distinct = None
+
+    @property
+    def distinct(self):
+        # Sorted distinct totals, built on the first rank lookup and then kept in step
+        if self._distinct is None:
+            self._distinct = sorted(self.score_counts)
+        return self._distinct
+
+    def _row(self, position):
+        if position in self.rows:
+            return self.rows[position]
+        base = self.base
+        return base.areas[position], base.totals[position], base.grades[position]
+
+    def _move(self, old, new):
+        # One Pourashava's total leaves the score counts and its new total joins them
+        for value, step in ((old, -1), (new, 1)):
+            if np.isnan(value):
+                continue
+            self.score_counts[value] += step
+            if self._distinct is not None:
+                if step > 0 and self.score_counts[value] == 1:
+                    bisect.insort(self._distinct, value)
+                elif step < 0 and self.score_counts[value] == 0:
+                    del self._distinct[bisect.bisect_left(self._distinct, value)]
+            if self.score_counts[value] == 0:
+                del self.score_counts[value]
+
+    def _rescore(self, name):
+        base = self.base
+        position = base.positions[name]
+        statuses, overrides = self.statuses_for(name), self.overrides_for(name)
+        _, old_total, old_grade = self._row(position)
+
+        if statuses or overrides:
+            areas = base.areas[position].copy()
+            for indicator, status in statuses.items():
+                status_points = base.rubric.status_points
+                delta = status_share(status, status_points) - status_share(base.status(name, indicator), status_points)
+                areas[INDICATOR_AREA[indicator]] += delta * base.points[indicator]
+            for column, score in overrides.items():
+                areas[AREA_COLUMNS.index(column)] = score
+            # The sheet total moves by however much the areas moved
+            total = base.totals[position] + (areas.sum() - base.areas[position].sum())
+            new_grade = str(grade([total], base.bands)[0]) if not np.isnan(total) else base.grades[position]
+            self.rows[position] = (areas, total, new_grade)
+        else:
+            # Back to the sheet's own total and grade
+            self.rows.pop(position, None)
+            total, new_grade = base.totals[position], base.grades[position]
+
+        self.grade_counts[old_grade] -= 1
+        self.grade_counts[new_grade] += 1
+        self._move(old_total, total)
+
+    def statuses_for(self, name):
+        return {indicator: status for (row, indicator), status in self.statuses.items() if row == name}
+
+    def overrides_for(self, name):
+        return {column: score for (row, column), score in self.overrides.items() if row == name}
+
+    def set_status(self, names, indicators, status):
+        if self.base.rubric is None:
+            raise ValueError('Changing indicator statuses needs the scoring rubric (IUGIP_RUBRIC)')
+        status_points = self.base.rubric.status_points
+        for name in names:
+            for indicator in indicators:
+                if status_share(status, status_points) == status_share(self.base.status(name, indicator), status_points):
+                    self.statuses.pop((name, indicator), None)
+                else:
+                    self.statuses[name, indicator] = status
+            self._rescore(name)
+
+    def set_area(self, names, column, score):
+        for name in names:
+            self.overrides[name, column] = float(score)
+            self._rescore(name)
+
+    def clear(self, names=None):
+        names = set(names) if names is not None else {self.base.names[position] for position in self.rows}
+        self.statuses = {key: value for key, value in self.statuses.items() if key[0] not in names}
+        self.overrides = {key: value for key, value in self.overrides.items() if key[0] not in names}
+        for name in names:
+            if self.base.positions[name] in self.rows:
+                self._rescore(name)
+
+    # Aggregates in the same shapes as iugip.aggregates.Aggregates
+
+    def grade_bar_counts(self):
+        return pd.Series([self.grade_counts.get(name, 0) for name in GRADES], index=pd.Index(GRADES, name='Grade'), name='Grade')
+
+    def grade_pie_counts(self):
+        counts = self.grade_bar_counts()
+        return counts[counts > 0]
+
+    def rank(self, name):
+        """Dense rank of a Pourashava's Total Score, 1 being the best."""
+        total = self._row(self.base.positions[name])[1]
+        if np.isnan(total):
+            return np.nan
+        return len(self.distinct) - bisect.bisect_right(self.distinct, total) + 1
+
+    def top_table(self, n=TOP_N):
+        base = self.base
+        # Unedited rows keep their baseline order, so only the first n of them can make the cut
+        leaders = []
+        for position in base.order:
+            if position not in self.rows:
+                leaders.append(position)
+                if len(leaders) == n:
+                    break
+        candidates = leaders + list(self.rows)
+        totals = np.array([self._row(position)[1] for position in candidates], dtype='float64')
+        order = np.argsort(-np.nan_to_num(totals, nan=-np.inf), kind='mergesort')[:n]
+        table = pd.DataFrame({
+            'Pourashava': [base.names[candidates[i]] for i in order],
+            'Total Score': totals[order].round(2),
+            'Grade': [self._row(candidates[i])[2] for i in order],
+        })
+        table.index += 1
+        return table
+
+    def changes(self):
+        """One row per edited Pourashava: baseline and scenario Total Score, Grade and rank."""
+        base = self.base
+        rows = []
+        for position in sorted(self.rows):
+            name = base.names[position]
+            _, total, new_grade = self.rows[position]
+            rows.append({
+                'Pourashava': name,
+                'Total Score': round(float(base.totals[position]), 2),
+                'New Total Score': round(float(total), 2),
+                'Grade': base.grades[position],
+                'New Grade': new_grade,
+                'Rank': base.ranks[position],
+                'New Rank': self.rank(name),
+            })
+        return pd.DataFrame(rows, columns=['Pourashava', 'Total Score', 'New Total Score', 'Grade', 'New Grade', 'Rank', 'New Rank'])